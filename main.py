@@ -3,6 +3,7 @@ Kiwi 语音助手 - 主程序入口
 
 使用新架构的完整语音助手系统
 """
+import logging
 import sys
 from pathlib import Path
 
@@ -13,4 +14,6 @@ sys.path.insert(0, str(project_root))
 from src.gui.kiwi_assistant_gui import main
 
 if __name__ == "__main__":
+    # 核心模块通过 logging 输出运行信息，保持与原先 print 一致的控制台输出格式
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     main()
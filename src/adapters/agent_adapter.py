@@ -223,7 +223,7 @@ class AgentModuleAdapter(IModule):
                     event_type="agent_response",
                     output_data={
                         'message': response.message,
-                        'success': response.status == AgentStatus.COMPLETED,
+                        'success': response.success,
                         'data': response.data
                     }
                 )
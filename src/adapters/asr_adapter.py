@@ -9,7 +9,7 @@ from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
 from src.core.interfaces import IASRModule
-from src.core.events import Event, EventType, ASREvent as ASREventType, ASRPayload
+from src.core.events import Event, EventType, ASRPayload
 from src.asr import create_asr_engine, ASRConfig
 from src.core.message_tracker import get_message_tracker
 
@@ -51,6 +51,12 @@ class ASRModuleAdapter(IASRModule):
         self._successful_recognitions = 0
         self._failed_recognitions = 0
         self._total_latency_ms = 0.0
+        
+        # 事件处理函数映射
+        self._event_handlers = {
+            EventType.VAD_SPEECH_END: self._on_speech_end,
+            EventType.SYSTEM_STOP: self._on_system_stop,
+        }
     
     @property
     def name(self) -> str:
@@ -123,22 +129,26 @@ class ASRModuleAdapter(IASRModule):
         if not self._engine or not self._running:
             return
         
-        # 处理语音结束事件 -> 触发识别
-        if event.type == EventType.VAD_SPEECH_END:
-            if self._enabled:
-                # 从事件中提取 msg_id
-                if event.msg_id:
-                    self._current_msg_id = event.msg_id
+        handler = self._event_handlers.get(event.type)
+        if handler:
+            handler(event)
+    
+    def _on_speech_end(self, event: Event):
+        """处理语音结束事件 -> 触发识别"""
+        if self._enabled:
+            # 从事件中提取 msg_id
+            if event.msg_id:
+                self._current_msg_id = event.msg_id
+            
+            # 使用强类型 payload 获取音频数据
+            audio_data = event.payload.audio_data
                 
-                # 使用强类型 payload 获取音频数据
-                audio_data = event.payload.audio_data
-                    
-                if audio_data is not None:
-                    self._start_recognition(audio_data)
-        
-        # 处理系统停止事件
-        elif event.type == EventType.SYSTEM_STOP:
-            self.stop()
+            if audio_data is not None:
+                self._start_recognition(audio_data)
+    
+    def _on_system_stop(self, event: Event):
+        """处理系统停止事件"""
+        self.stop()
     
     @property
     def is_running(self) -> bool:
@@ -248,11 +258,11 @@ class ASRModuleAdapter(IASRModule):
         
         # 发送ASR开始识别事件
         try:
-            start_event = ASREventType(
-                event_type=EventType.ASR_RECOGNITION_START,
-                source=self.name,
-                payload=ASRPayload(text="", confidence=0.0, is_partial=False),
-                msg_id=self._current_msg_id or ""
+            start_event = Event.of(
+                self.name,
+                ASRPayload(text="", confidence=0.0, is_partial=False),
+                self._current_msg_id or "",
+                event_type=EventType.ASR_RECOGNITION_START
             )
             self._controller.publish_event(start_event)
             print(f"📤 [ASR] 已发送 ASR_RECOGNITION_START 事件")
@@ -305,16 +315,16 @@ class ASRModuleAdapter(IASRModule):
                     tracker.update_query(self._current_msg_id, text)
                 
                 # 发布识别成功事件
-                event = ASREventType(
-                    event_type=EventType.ASR_RECOGNITION_SUCCESS,
-                    source=self.name,
-                    payload=ASRPayload(
+                event = Event.of(
+                    self.name,
+                    ASRPayload(
                         text=text,
                         confidence=confidence,
                         is_partial=False,
                         latency_ms=latency_ms
                     ),
-                    msg_id=self._current_msg_id
+                    self._current_msg_id,
+                    event_type=EventType.ASR_RECOGNITION_SUCCESS
                 )
                 self._controller.publish_event(event)
                 
@@ -331,15 +341,15 @@ class ASRModuleAdapter(IASRModule):
                 print(f"⚠️ [{self.name}] 识别失败或结果为空")
                 
                 # 发布识别失败事件
-                event = ASREventType(
-                    event_type=EventType.ASR_RECOGNITION_FAILED,
-                    source=self.name,
-                    payload=ASRPayload(
+                event = Event.of(
+                    self.name,
+                    ASRPayload(
                         text="",
                         confidence=0.0,
                         is_partial=False
                     ),
-                    msg_id=self._current_msg_id or ""
+                    self._current_msg_id or "",
+                    event_type=EventType.ASR_RECOGNITION_FAILED
                 )
                 self._controller.publish_event(event)
                 
@@ -355,15 +365,15 @@ class ASRModuleAdapter(IASRModule):
             traceback.print_exc()
             
             # 发布识别失败事件
-            event = ASREventType(
-                event_type=EventType.ASR_RECOGNITION_FAILED,
-                source=self.name,
-                payload=ASRPayload(
+            event = Event.of(
+                self.name,
+                ASRPayload(
                     text=f"Error: {str(e)}",
                     confidence=0.0,
                     is_partial=False
                 ),
-                msg_id=self._current_msg_id or ""
+                self._current_msg_id or "",
+                event_type=EventType.ASR_RECOGNITION_FAILED
             )
             self._controller.publish_event(event)
             
@@ -35,6 +35,12 @@ class AudioModuleAdapter(IAudioModule):
         self._running = False
         self._frame_callback: Optional[Callable] = None
         
+        # 事件处理函数映射
+        self._event_handlers = {
+            EventType.SYSTEM_STOP: self._on_system_stop,
+            EventType.AUDIO_DEVICE_CHANGED: self._on_device_changed,
+        }
+        
         # 统计
         self._frames_processed = 0
     
@@ -48,8 +54,8 @@ class AudioModuleAdapter(IAudioModule):
             # 创建 AudioRecorder
             self._recorder = AudioRecorder(self._config)
             
-            # 使用异步读取方式设置回调
-            self._recorder.read_async(self._on_audio_frame)
+            # 使用异步读取方式设置回调（零拷贝：帧数据为环形缓冲区视图，事件分发期间有效）
+            self._recorder.read_async(self._on_audio_frame, zero_copy=True)
             
             print(f"✅ [{self.name}] 初始化成功")
             print(f"   采样率: {self._config.sample_rate}")
@@ -106,13 +112,19 @@ class AudioModuleAdapter(IAudioModule):
         """
         # 音频模块通常不需要处理其他模块的事件
         # 但可以响应系统控制事件
-        if event.type == EventType.SYSTEM_STOP:
-            self.stop()
-        elif event.type == EventType.AUDIO_DEVICE_CHANGED:
-            # 处理设备切换
-            device_id = event.payload.get('device_id') if event.payload else None
-            if device_id is not None:
-                self.set_device(device_id)
+        handler = self._event_handlers.get(event.type)
+        if handler:
+            handler(event)
+    
+    def _on_system_stop(self, event: Event):
+        """处理系统停止事件"""
+        self.stop()
+    
+    def _on_device_changed(self, event: Event):
+        """处理设备切换事件"""
+        device_id = event.payload.get('device_id') if event.payload else None
+        if device_id is not None:
+            self.set_device(device_id)
     
     @property
     def is_running(self) -> bool:
@@ -121,7 +133,11 @@ class AudioModuleAdapter(IAudioModule):
     # ==================== IAudioModule 专用接口 ====================
     
     def set_audio_callback(self, callback: Callable[[Any], None]):
-        """设置音频帧回调（除了发送到控制器外的额外回调）"""
+        """
+        设置音频帧回调（除了发送到控制器外的额外回调）
+        
+        帧数据只在回调执行期间有效，需要保留时应自行拷贝
+        """
         self._frame_callback = callback
     
     def get_available_devices(self) -> list:
@@ -158,25 +174,17 @@ class AudioModuleAdapter(IAudioModule):
         Args:
             frame: 音频帧
         """
-        from src.core.events import AudioFrameEvent, AudioFramePayload
-        
         self._frames_processed += 1
         
         # 直接发布音频帧事件（符合事件驱动架构）
         if self._controller:
-            event = AudioFrameEvent(
+            event = AudioFrameEvent.acquire(
                 source=self.name,
-                payload=AudioFramePayload(
-                    frame_data=frame.data,
-                    sample_rate=self._config.sample_rate,
-                    channels=1
-                )
+                frame_data=frame.data,
+                sample_rate=self._config.sample_rate
             )
             self._controller.publish_event(event)
-            
-            # 定期检查超时
-            if self._frames_processed % 10 == 0:  # 每10帧检查一次
-                self._controller.check_timeout()
+            event.release()
         
         # 如果有额外的回调，也调用它
         if self._frame_callback:
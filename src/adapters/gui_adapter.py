@@ -4,6 +4,7 @@ GUI模块适配器
 将GUI组件接入新架构的事件系统
 """
 from typing import Optional, Callable
+import numpy as np
 from PyQt5.QtCore import QObject, pyqtSignal
 
 from src.core.interfaces import IGUIModule
@@ -112,7 +113,7 @@ class GUIModuleAdapter(QObject):
             event: 事件对象
         """
         if not self._running:
-            print(f"⚠️ [{self.name}#{self._instance_id}] 已停止，忽略事件: {event.type.value}")
+            print(f"⚠️ [{self.name}#{self._instance_id}] 已停止，忽略事件: {event.type}")
             return
         
         # 根据事件类型调用相应的处理函数
@@ -210,22 +211,25 @@ class GUIModuleAdapter(QObject):
         """处理音频帧事件（用于波形显示）"""
         # 注意：这个事件频率很高，谨慎处理
         # 使用新的 Payload 模式获取数据
-        if not event.payload:
+        payload = event.payload
+        if not payload:
             return
         
-        data = {
-            'audio_data': event.payload.frame_data,
-            'sample_rate': event.payload.sample_rate,
-            'timestamp': event.timestamp
-        }
         # 只在GUI需要更新时发送信号
-        if self._running and event.payload.frame_data is not None:
+        if self._running and payload.frame_data is not None:
+            # 帧数据可能是录音缓冲区的视图，跨线程交给GUI前需要拷贝
+            # （每帧的数据和时间戳都不同，字典无法在帧之间共享）
+            data = {
+                'audio_data': np.array(payload.frame_data),
+                'sample_rate': payload.sample_rate,
+                'timestamp': event.timestamp
+            }
             self.audio_frame_signal.emit(data)
     
     def _on_gui_update_text(self, event: Event):
         """处理GUI文本更新事件（包括Orchestrator决策结果和Agent响应）"""
-        # GUI_UPDATE_TEXT 使用 payload 传递数据
-        if not event.payload or not isinstance(event.payload, dict):
+        # GUI_UPDATE_TEXT 的 payload 总是 dict（见 PAYLOAD_TYPES）
+        if not event.payload:
             return
         
         update_type = event.payload.get('type', '')
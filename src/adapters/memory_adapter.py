@@ -79,10 +79,10 @@ class MemoryModuleAdapter(IMemoryModule):
     
     def add_short_term_memory(self, event):
         """根据事件添加短期记忆条目"""
-        print(f"✅ [memory] 处理事件: {event.type.value}")
+        print(f"✅ [memory] 处理事件: {event.type}")
 
-        # GUI_UPDATE_TEXT 事件使用 payload 传递数据
-        if not event.payload or not isinstance(event.payload, dict):
+        # GUI_UPDATE_TEXT 的 payload 总是 dict（见 PAYLOAD_TYPES）
+        if not event.payload:
             return
         
         update_type = event.payload.get('type', '')
@@ -95,7 +95,7 @@ class MemoryModuleAdapter(IMemoryModule):
                 'response': event.payload.get('message', ''),
                 'timestamp': event.timestamp,
                 'status': event.payload.get('status', AgentStatus.ERROR).value,  # 使用 status 字段
-                'tools_used': event.payload.get('tools_used', []),
+                'tools_used': event.payload.get('tools_used', ()),
                 'data': event.payload.get('data', {})
             }
             self._memory_manager.add_short_term_memory(memory_data)
@@ -6,7 +6,7 @@ import os
 from typing import TYPE_CHECKING, Optional
 
 from src.core.interfaces import IModule
-from src.core.events import Event, EventType, ASREvent, AgentRequestEvent, AgentRequestPayload
+from src.core.events import Event, EventType, ASREvent, AgentRequestPayload
 from src.orchestrator import Orchestrator
 from src.core.message_tracker import get_message_tracker
 
@@ -239,12 +239,11 @@ class OrchestratorModuleAdapter(IModule):
         #     }
         # )
 
-        dispatch_event = AgentRequestEvent(
-            source=self._name,
-            payload=AgentRequestPayload(
+        dispatch_event = Event.of(
+            self._name,
+            AgentRequestPayload(
                 agent_name=agent_name,
                 query=query,
-                context={},
                 decision={
                     'selected_agent': decision.selected_agent,
                     'confidence': decision.confidence,
@@ -252,7 +251,7 @@ class OrchestratorModuleAdapter(IModule):
                     'parameters': decision.parameters
                 }
             ),
-            msg_id=msg_id,
+            msg_id,
             session_id=decision.parameters.get('session_id', None),
             session_action=decision.parameters.get('session_action', 'new')
         )
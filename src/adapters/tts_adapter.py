@@ -32,6 +32,12 @@ class TTSModuleAdapter(IModule):
         self._last_text: Optional[str] = None
         self._last_request_time: float = 0
         self._dedup_window: float = 1.0  # 防抖窗口: 1秒内相同文本只播报一次
+        
+        # 事件处理函数映射
+        self._event_handlers = {
+            EventType.TTS_SPEAK_REQUEST: self._handle_speak_request,
+            EventType.SYSTEM_STOP: self._on_system_stop,
+        }
     
     @property
     def name(self) -> str:
@@ -96,10 +102,13 @@ class TTSModuleAdapter(IModule):
         if not self._running:
             return
         
-        if event.type == EventType.TTS_SPEAK_REQUEST:
-            self._handle_speak_request(event)
-        elif event.type == EventType.SYSTEM_STOP:
-            self.stop()
+        handler = self._event_handlers.get(event.type)
+        if handler:
+            handler(event)
+    
+    def _on_system_stop(self, event: Event):
+        """处理系统停止事件"""
+        self.stop()
     
     def _handle_speak_request(self, event: Event):
         """处理TTS播报请求"""
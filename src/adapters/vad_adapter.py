@@ -8,7 +8,7 @@ import numpy as np
 from collections import deque
 
 from src.core.interfaces import IVADModule
-from src.core.events import Event, EventType, VADEvent as VADEventType, VADPayload
+from src.core.events import Event, EventType, VADPayload
 from src.vad import VADFactory, VADConfig, VADResult, VADEvent, VADState
 from src.core.message_tracker import get_message_tracker
 
@@ -48,6 +48,14 @@ class VADModuleAdapter(IVADModule):
         # 统计
         self._frames_processed = 0
         self._speech_segments = 0
+        
+        # 事件处理函数映射
+        self._event_handlers = {
+            EventType.WAKEWORD_DETECTED: self._on_wakeword_detected,
+            EventType.WAKEWORD_RESET: self._on_wakeword_reset,
+            EventType.AUDIO_FRAME_READY: self._on_audio_frame,
+            EventType.SYSTEM_STOP: self._on_system_stop,
+        }
     
     @property
     def name(self) -> str:
@@ -107,30 +115,34 @@ class VADModuleAdapter(IVADModule):
         if not self._engine or not self._running:
             return
         
-        # 处理唤醒词事件 - 启动VAD延迟
-        if event.type == EventType.WAKEWORD_DETECTED:
-            # 记录当前对话的 msg_id（从唤醒事件获取）
-            if hasattr(event, 'msg_id') and event.msg_id:
-                self._current_msg_id = event.msg_id
-                print(f"🔗 [{self.name}] 关联消息ID: {self._current_msg_id}")
-            
-            if hasattr(self._engine, 'on_wakeword_detected'):
-                self._engine.on_wakeword_detected()
-        
-        # 处理唤醒词重置事件 - 重置VAD引擎
-        elif event.type == EventType.WAKEWORD_RESET:
-            self.reset()
-            self._current_msg_id = None  # 清除 msg_id
-        
-        # 处理音频帧事件 - 只在非IDLE状态处理
-        elif event.type == EventType.AUDIO_FRAME_READY:
-            if self._enabled and self._should_process_audio():
-                # AudioFrameEvent 没有 msg_id，使用已保存的 _current_msg_id
-                self._process_audio_frame(event.payload.frame_data, event.payload.sample_rate)
+        handler = self._event_handlers.get(event.type)
+        if handler:
+            handler(event)
+    
+    def _on_wakeword_detected(self, event: Event):
+        """处理唤醒词事件 - 启动VAD延迟"""
+        # 记录当前对话的 msg_id（从唤醒事件获取）
+        if hasattr(event, 'msg_id') and event.msg_id:
+            self._current_msg_id = event.msg_id
+            print(f"🔗 [{self.name}] 关联消息ID: {self._current_msg_id}")
         
-        # 处理系统停止事件
-        elif event.type == EventType.SYSTEM_STOP:
-            self.stop()
+        if hasattr(self._engine, 'on_wakeword_detected'):
+            self._engine.on_wakeword_detected()
+    
+    def _on_wakeword_reset(self, event: Event):
+        """处理唤醒词重置事件 - 重置VAD引擎"""
+        self.reset()
+        self._current_msg_id = None  # 清除 msg_id
+    
+    def _on_audio_frame(self, event: Event):
+        """处理音频帧事件 - 只在非IDLE状态处理"""
+        if self._enabled and self._should_process_audio():
+            # AudioFrameEvent 没有 msg_id，使用已保存的 _current_msg_id
+            self._process_audio_frame(event.payload.frame_data, event.payload.sample_rate)
+    
+    def _on_system_stop(self, event: Event):
+        """处理系统停止事件"""
+        self.stop()
     
     @property
     def is_running(self) -> bool:
@@ -272,15 +284,15 @@ class VADModuleAdapter(IVADModule):
                 )
             
             # 发布事件
-            event = VADEventType(
-                event_type=EventType.VAD_SPEECH_START,
-                source=self.name,
-                payload=VADPayload(
+            event = Event.of(
+                self.name,
+                VADPayload(
                     audio_data=None,
                     duration_ms=0,
                     is_speech=True
                 ),
-                msg_id=self._current_msg_id
+                self._current_msg_id,
+                event_type=EventType.VAD_SPEECH_START
             )
             self._controller.publish_event(event)
             
@@ -314,15 +326,15 @@ class VADModuleAdapter(IVADModule):
                 )
             
             # 发布事件
-            event = VADEventType(
-                event_type=EventType.VAD_SPEECH_END,
-                source=self.name,
-                payload=VADPayload(
+            event = Event.of(
+                self.name,
+                VADPayload(
                     audio_data=audio_data,
                     duration_ms=duration_ms,
                     is_speech=False  # speech ended
                 ),
-                msg_id=self._current_msg_id
+                self._current_msg_id,
+                event_type=EventType.VAD_SPEECH_END
             )
             self._controller.publish_event(event)
             
@@ -7,7 +7,7 @@ from typing import Optional, Dict, Any
 import numpy as np
 
 from src.core.interfaces import IWakewordModule
-from src.core.events import Event, EventType, WakewordEvent, WakewordPayload
+from src.core.events import Event, EventType, WakewordPayload
 from src.wakeword import WakeWordFactory, WakeWordConfig, WakeWordResult, WakeWordState
 from src.core.message_tracker import get_message_tracker
 
@@ -40,6 +40,13 @@ class WakewordModuleAdapter(IWakewordModule):
         # 统计
         self._detections = 0
         self._frames_processed = 0
+        
+        # 事件处理函数映射
+        self._event_handlers = {
+            EventType.AUDIO_FRAME_READY: self._on_audio_frame,
+            EventType.WAKEWORD_RESET: self._on_reset,
+            EventType.SYSTEM_STOP: self._on_system_stop,
+        }
     
     @property
     def name(self) -> str:
@@ -97,18 +104,22 @@ class WakewordModuleAdapter(IWakewordModule):
         if not self._engine or not self._running:
             return
         
-        # 处理音频帧事件 - 只在IDLE状态处理
-        if event.type == EventType.AUDIO_FRAME_READY:
-            if self._enabled and self._should_process_audio():
-                self._process_audio_frame(event.payload.frame_data, event.payload.sample_rate)
-        
-        # 处理重置事件
-        elif event.type == EventType.WAKEWORD_RESET:
-            self.reset()
-        
-        # 处理系统停止事件
-        elif event.type == EventType.SYSTEM_STOP:
-            self.stop()
+        handler = self._event_handlers.get(event.type)
+        if handler:
+            handler(event)
+    
+    def _on_audio_frame(self, event: Event):
+        """处理音频帧事件 - 只在IDLE状态处理"""
+        if self._enabled and self._should_process_audio():
+            self._process_audio_frame(event.payload.frame_data, event.payload.sample_rate)
+    
+    def _on_reset(self, event: Event):
+        """处理重置事件"""
+        self.reset()
+    
+    def _on_system_stop(self, event: Event):
+        """处理系统停止事件"""
+        self.stop()
     
     @property
     def is_running(self) -> bool:
@@ -224,9 +235,9 @@ class WakewordModuleAdapter(IWakewordModule):
             print(f"{'='*60}")
             
             # 发布唤醒词检测事件（带上msg_id）
-            event = WakewordEvent(
-                source=self.name,
-                payload=WakewordPayload(
+            event = Event.of(
+                self.name,
+                WakewordPayload(
                     keyword=result['keyword'],
                     confidence=result['confidence']
                 ),
@@ -17,6 +17,7 @@ class ASRConfig:
     temperature: float = 0.0            # 采样温度
     vad_filter: bool = True             # 是否使用VAD过滤
     initial_prompt: Optional[str] = None  # 初始提示词
+    chunk_duration: float = 0.0         # 长音频分块识别时长(秒)，0=不分块
     
     def validate(self):
         """验证配置参数"""
@@ -28,6 +29,9 @@ class ASRConfig:
         
         if self.device not in ("auto", "cpu", "cuda", "mps"):
             raise ValueError(f"Invalid device: {self.device}")
+        
+        if self.chunk_duration < 0:
+            raise ValueError(f"Invalid chunk_duration: {self.chunk_duration}")
 
 
 @dataclass
@@ -3,8 +3,10 @@ Whisper ASR 引擎实现
 """
 import numpy as np
 import time
-from typing import Optional
+from typing import List, Optional
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 
 from .base import ASREngine
 from .types import ASRConfig, ASRResult, Segment
@@ -13,6 +15,13 @@ from .exceptions import ModelNotFoundError, RecognitionError, AudioFormatError
 # 延迟导入 whisper，避免启动时加载
 _whisper = None
 
+# zhconv 为可选依赖，模块加载时探测一次
+try:
+    import zhconv
+    _zhconv_convert = zhconv.convert
+except ImportError:
+    _zhconv_convert = None
+
 
 def _get_whisper():
     """延迟加载 whisper 模块"""
@@ -28,6 +37,45 @@ def _get_whisper():
     return _whisper
 
 
+# 常用繁体到简体映射表（zhconv 不可用时的兜底）
+_T2S_MAP = {
+    '無': '无', '會': '会', '來': '来', '過': '过', '們': '们',
+    '個': '个', '這': '这', '裡': '里', '邊': '边',
+    '說': '说', '話': '话', '時': '时', '間': '间', '樣': '样',
+    '點': '点', '從': '从', '對': '对', '為': '为', '與': '与',
+    '給': '给', '關': '关', '開': '开', '學': '学', '現': '现',
+    '見': '见', '覺': '觉', '認': '认', '識': '识', '讓': '让',
+    '幾': '几', '處': '处', '應': '应', '該': '该', '導': '导',
+    '種': '种', '經': '经', '長': '长', '門': '门', '問': '问',
+    '陽': '阳', '陰': '阴', '電': '电', '腦': '脑',
+    '網': '网', '頁': '页', '線': '线', '務': '务', '業': '业',
+    '產': '产', '資': '资', '際': '际', '術': '术', '據': '据',
+    '標': '标', '準': '准', '確': '确', '質': '质', '體': '体',
+    '總': '总', '統': '统', '義': '义', '議': '议', '論': '论',
+    '調': '调', '運': '运', '進': '进', '連': '连', '選': '选',
+    '還': '还', '錯': '错', '難': '难', '題': '题', '類': '类',
+    '願': '愿', '顯': '显', '風': '风', '養': '养', '餘': '余',
+}
+_T2S_TABLE = str.maketrans(_T2S_MAP)
+
+# int16 -> [-1.0, 1.0) 的归一化系数
+_INT16_SCALE = np.float32(1.0 / 32768.0)
+
+# 需要繁简转换的语言代码（Whisper 检测结果）
+_CHINESE_LANGUAGES = ("zh", "yue")
+
+# Whisper 单个解码窗口：30 秒 / 3000 帧 mel
+_WINDOW_SAMPLES = 30 * 16000
+_WINDOW_FRAMES = 3000
+
+# 与 whisper.transcribe 默认值一致的静音判定阈值
+_NO_SPEECH_THRESHOLD = 0.6
+_LOGPROB_THRESHOLD = -1.0
+
+# 超过该时长(秒)的音频识别后释放 CUDA 缓存
+_CUDA_CACHE_RELEASE_SECONDS = 30.0
+
+
 class WhisperEngine(ASREngine):
     """Whisper ASR 引擎"""
     
@@ -50,6 +98,10 @@ class WhisperEngine(ASREngine):
             "temperature": config.temperature,
             "initial_prompt": config.initial_prompt,
         }
+        
+        # 单窗口解码复用的 mel 缓冲区（首次使用时在模型所在设备上分配）
+        self._mel_buf = None
+        self._mel_lock = threading.Lock()
     
     def _load_model(self):
         """加载 Whisper 模型"""
@@ -114,40 +166,191 @@ class WhisperEngine(ASREngine):
         try:
             start_time = time.time()
             
-            # 预处理音频
-            audio = self._preprocess_audio(audio, sample_rate)
-            
-            # 计算音频时长
-            duration = len(audio) / 16000.0
-            
-            # 如果音频太短，返回空结果
-            if duration < 0.1:
-                return ASRResult(
-                    text="",
-                    language=self.config.language,
-                    confidence=0.0,
-                    duration=duration,
-                    processing_time=time.time() - start_time
-                )
-            
-            # 调用 Whisper 识别
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                result = self.model.transcribe(
-                    audio,
-                    **self.decode_options
-                )
+            # 长音频分块识别，避免整段音频的多份拷贝同时驻留内存
+            chunk_samples = int(self.config.chunk_duration * sample_rate)
+            if 0 < chunk_samples < len(audio):
+                result, duration = self._transcribe_chunked(audio, sample_rate, chunk_samples)
+            else:
+                # 预处理音频
+                audio = self._preprocess_audio(audio, sample_rate)
+                
+                # 计算音频时长
+                duration = len(audio) / 16000.0
+                
+                # 如果音频太短，返回空结果
+                if duration < 0.1:
+                    return ASRResult(
+                        text="",
+                        language=self.config.language,
+                        confidence=0.0,
+                        duration=duration,
+                        processing_time=time.time() - start_time
+                    )
+                
+                result = self._transcribe(audio)
             
             processing_time = time.time() - start_time
 
             print(f"asr result: {result}")  ##############
             
             # 解析结果
-            return self._parse_result(result, duration, processing_time)
+            asr_result = self._parse_result(result, duration, processing_time)
+            
+            # 长音频识别后释放中间结果和 CUDA 缓存，降低显存峰值
+            del result
+            if self.config.device == "cuda" and duration > _CUDA_CACHE_RELEASE_SECONDS:
+                import torch
+                torch.cuda.empty_cache()
+            
+            return asr_result
         
         except Exception as e:
             raise RecognitionError(f"Recognition failed: {e}")
     
+    def _transcribe(self, audio: np.ndarray) -> dict:
+        """
+        调用 Whisper 识别已预处理的音频
+        
+        Args:
+            audio: 16kHz 单声道 float32 音频
+            
+        Returns:
+            Whisper 原始结果
+        """
+        # 推理模式下不记录自动求导图
+        import torch
+        with torch.inference_mode(), warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            
+            # 不超过一个 30 秒窗口的音频直接解码，跳过 transcribe 的整段填充
+            if len(audio) <= _WINDOW_SAMPLES:
+                return self._decode_window(audio)
+            
+            return self.model.transcribe(
+                audio,
+                **self.decode_options
+            )
+    
+    def _decode_window(self, audio: np.ndarray) -> dict:
+        """
+        在单个 30 秒窗口内直接解码
+        
+        只对实际音频计算 mel，拷贝进预分配的定长缓冲区，剩余部分用
+        静音对应的 mel 下限值填充（与 transcribe 补零后的结果一致）。
+        
+        Args:
+            audio: 16kHz 单声道 float32 音频，长度不超过 30 秒
+            
+        Returns:
+            与 transcribe 相同结构的结果字典
+        """
+        import torch
+        whisper = _get_whisper()
+        
+        with self._mel_lock:
+            if self._mel_buf is None:
+                self._mel_buf = torch.empty(
+                    (self.model.dims.n_mels, _WINDOW_FRAMES),
+                    dtype=torch.float32,
+                    device=self.model.device
+                )
+            
+            mel = whisper.log_mel_spectrogram(
+                audio, self.model.dims.n_mels, device=self.model.device
+            )
+            n_frames = min(mel.shape[-1], _WINDOW_FRAMES)
+            self._mel_buf[:, :n_frames].copy_(mel[:, :n_frames])
+            
+            # 静音在 log-mel 中被截断到 max-8，归一化后为 max-2，且不低于 -1.5
+            floor = max(mel.max().item() - 2.0, -1.5)
+            self._mel_buf[:, n_frames:].fill_(floor)
+            del mel
+            
+            options = whisper.DecodingOptions(
+                language=self.config.language,
+                temperature=self.config.temperature,
+                # 采样解码时不能使用束搜索
+                beam_size=self.config.beam_size if self.config.temperature == 0 else None,
+                prompt=self.config.initial_prompt,
+                fp16=self.config.device == "cuda",
+            )
+            decoded = whisper.decode(self.model, self._mel_buf, options)
+        
+        # 与 transcribe 相同的静音判定：无语音概率高且平均对数概率低则丢弃
+        if decoded.no_speech_prob > _NO_SPEECH_THRESHOLD and decoded.avg_logprob < _LOGPROB_THRESHOLD:
+            return {"text": "", "language": decoded.language, "segments": []}
+        
+        return {
+            "text": decoded.text,
+            "language": decoded.language,
+            "segments": [{
+                "id": 0,
+                "start": 0.0,
+                "end": len(audio) / 16000.0,
+                "text": decoded.text,
+                "avg_logprob": decoded.avg_logprob,
+                "no_speech_prob": decoded.no_speech_prob,
+            }],
+        }
+    
+    def _transcribe_chunked(self, audio: np.ndarray, sample_rate: int, chunk_samples: int):
+        """
+        分块识别长音频
+        
+        后台线程预处理下一块的同时识别当前块，每块识别完即释放，
+        内存峰值与块长度相关而不是与整段音频长度相关。
+        
+        Args:
+            audio: 原始音频
+            sample_rate: 采样率
+            chunk_samples: 每块的采样点数
+            
+        Returns:
+            (合并后的 Whisper 结果, 音频时长)
+        """
+        texts = []
+        segments = []
+        language = None
+        duration = 0.0
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self._preprocess_audio, audio[:chunk_samples], sample_rate)
+            for offset in range(0, len(audio), chunk_samples):
+                chunk = future.result()
+                next_offset = offset + chunk_samples
+                if next_offset < len(audio):
+                    future = executor.submit(
+                        self._preprocess_audio,
+                        audio[next_offset:next_offset + chunk_samples],
+                        sample_rate
+                    )
+                
+                chunk_start = duration
+                duration += len(chunk) / 16000.0
+                
+                # 过短的尾块不送识别
+                if len(chunk) / 16000.0 < 0.1:
+                    continue
+                
+                result = self._transcribe(chunk)
+                del chunk
+                
+                texts.append(result.get("text", ""))
+                if language is None:
+                    language = result.get("language")
+                for seg in result.get("segments", []):
+                    seg = dict(seg)
+                    seg["start"] = seg.get("start", 0.0) + chunk_start
+                    seg["end"] = seg.get("end", 0.0) + chunk_start
+                    segments.append(seg)
+        
+        merged = {
+            "text": "".join(texts),
+            "language": language or self.config.language,
+            "segments": segments,
+        }
+        return merged, duration
+    
     def _preprocess_audio(self, audio: np.ndarray, sample_rate: int) -> np.ndarray:
         """
         预处理音频
@@ -161,7 +364,8 @@ class WhisperEngine(ASREngine):
         """
         # 转换为 float32
         if audio.dtype == np.int16:
-            audio = audio.astype(np.float32) / 32768.0
+            # 类型转换与缩放合并为一次遍历，避免中间的 float32 临时数组
+            audio = np.multiply(audio, _INT16_SCALE, dtype=np.float32)
         elif audio.dtype != np.float32:
             audio = audio.astype(np.float32)
         
@@ -211,37 +415,41 @@ class WhisperEngine(ASREngine):
         Returns:
             ASR 结果
         """
+        # 提取语言
+        language = result.get("language", self.config.language)
+        
+        # 只有中文结果才需要繁体转简体
+        needs_t2s = language is None or language in _CHINESE_LANGUAGES
+        
         # 提取文本
         text = result.get("text", "").strip()
         
         # 繁体转简体
-        text = self._convert_to_simplified(text)
-        
-        # 提取语言
-        language = result.get("language", self.config.language)
+        if needs_t2s:
+            text = self._convert_to_simplified(text)
         
         # 提取分段信息
         segments = []
         raw_segments = result.get("segments", [])
+        confidences = self._calculate_confidences(raw_segments)
         
-        total_confidence = 0.0
         for i, seg in enumerate(raw_segments):
             segment_text = seg.get("text", "").strip()
             # 分段文本也转换为简体
-            segment_text = self._convert_to_simplified(segment_text)
+            if needs_t2s:
+                segment_text = self._convert_to_simplified(segment_text)
             
             segment = Segment(
                 id=i,
                 start=seg.get("start", 0.0),
                 end=seg.get("end", 0.0),
                 text=segment_text,
-                confidence=self._calculate_confidence(seg)
+                confidence=float(confidences[i])
             )
             segments.append(segment)
-            total_confidence += segment.confidence
         
         # 计算整体置信度
-        confidence = total_confidence / len(segments) if segments else 0.0
+        confidence = float(confidences.mean()) if segments else 0.0
         
         return ASRResult(
             text=text,
@@ -265,13 +473,13 @@ class WhisperEngine(ASREngine):
         if not text:
             return text
         
+        # 如果没有 zhconv，使用内置的简单映射
+        if _zhconv_convert is None:
+            return self._simple_t2s(text)
+        
         try:
             # 使用 zhconv 进行转换（更简单可靠）
-            import zhconv
-            return zhconv.convert(text, 'zh-cn')
-        except ImportError:
-            # 如果没有 zhconv，使用内置的简单映射
-            return self._simple_t2s(text)
+            return _zhconv_convert(text, 'zh-cn')
         except Exception as e:
             # 转换失败时返回原文本
             print(f"Warning: Failed to convert text to simplified Chinese: {e}")
@@ -287,48 +495,30 @@ class WhisperEngine(ASREngine):
         Returns:
             转换后的文本
         """
-        # 常用繁体到简体映射表
-        t2s_map = {
-            '無': '无', '會': '会', '來': '来', '過': '过', '們': '们',
-            '個': '个', '這': '这', '那': '那', '裡': '里', '邊': '边',
-            '說': '说', '話': '话', '時': '时', '間': '间', '樣': '样',
-            '點': '点', '從': '从', '對': '对', '為': '为', '與': '与',
-            '給': '给', '關': '关', '開': '开', '學': '学', '現': '现',
-            '見': '见', '覺': '觉', '認': '认', '識': '识', '讓': '让',
-            '幾': '几', '處': '处', '應': '应', '該': '该', '導': '导',
-            '種': '种', '經': '经', '長': '长', '門': '门', '問': '问',
-            '間': '间', '陽': '阳', '陰': '阴', '電': '电', '腦': '脑',
-            '網': '网', '頁': '页', '線': '线', '務': '务', '業': '业',
-            '產': '产', '資': '资', '際': '际', '術': '术', '據': '据',
-            '標': '标', '準': '准', '確': '确', '質': '质', '體': '体',
-            '總': '总', '統': '统', '義': '义', '議': '议', '論': '论',
-            '調': '调', '運': '运', '進': '进', '連': '连', '選': '选',
-            '還': '还', '錯': '错', '難': '难', '題': '题', '類': '类',
-            '願': '愿', '顯': '显', '風': '风', '養': '养', '餘': '余',
-        }
-        
-        result = []
-        for char in text:
-            result.append(t2s_map.get(char, char))
-        return ''.join(result)
+        return text.translate(_T2S_TABLE)
     
-    def _calculate_confidence(self, segment: dict) -> float:
+    def _calculate_confidences(self, segments: List[dict]) -> np.ndarray:
         """
-        计算分段置信度
+        批量计算分段置信度
         
         Args:
-            segment: Whisper 分段信息
+            segments: Whisper 分段信息列表
             
         Returns:
-            置信度 (0.0-1.0)
+            各分段置信度数组 (0.0-1.0)
         """
         # Whisper 返回的是 avg_logprob 和 no_speech_prob
-        avg_logprob = segment.get("avg_logprob", -1.0)
-        no_speech_prob = segment.get("no_speech_prob", 1.0)
+        count = len(segments)
+        avg_logprob = np.fromiter(
+            (seg.get("avg_logprob", -1.0) for seg in segments), dtype=np.float64, count=count
+        )
+        no_speech_prob = np.fromiter(
+            (seg.get("no_speech_prob", 1.0) for seg in segments), dtype=np.float64, count=count
+        )
         
         # 转换为置信度
         # avg_logprob 通常在 -1 到 0 之间，越接近0越好
         # no_speech_prob 越小越好
-        confidence = np.exp(avg_logprob) * (1 - no_speech_prob)
+        confidences = np.exp(avg_logprob) * (1 - no_speech_prob)
         
-        return float(np.clip(confidence, 0.0, 1.0))
+        return np.clip(confidences, 0.0, 1.0)
@@ -3,11 +3,10 @@
 """
 import numpy as np
 import sounddevice as sd
-import queue
 import threading
 import time
 from typing import Optional, Callable, Iterator, List, Dict
-from collections import defaultdict
+from collections import defaultdict, deque
 
 from .types import AudioConfig, AudioFrame, RecorderStatus, AudioDevice
 from .exceptions import (
@@ -20,6 +19,9 @@ from .preprocessor import AudioPreprocessor
 class AudioRecorder:
     """音频录音器"""
     
+    # int16 -> [-1.0, 1.0) 的归一化系数
+    _INT16_SCALE = np.float32(1.0 / 32768.0)
+    
     def __init__(self, config: AudioConfig):
         """
         初始化录音器
@@ -43,9 +45,35 @@ class AudioRecorder:
         self._frames_captured = 0
         self._dropped_frames = 0
         
-        # 缓冲区
-        buffer_capacity = int(config.sample_rate * config.buffer_size / config.chunk_size)
-        self._buffer = queue.Queue(maxsize=buffer_capacity)
+        # 环形缓冲区：预分配连续内存，回调线程只做拷贝，不分配对象
+        buffer_capacity = max(1, int(config.sample_rate * config.buffer_size / config.chunk_size))
+        self._capacity = buffer_capacity
+        self._ring = np.empty((buffer_capacity, config.chunk_size * config.channels), dtype=np.float32)
+        self._ring_timestamps = np.empty(buffer_capacity, dtype=np.float64)
+        self._ring_frame_ids = np.empty(buffer_capacity, dtype=np.int64)
+        self._head = 0  # 下一个待读取的位置
+        self._tail = 0  # 下一个待写入的位置
+        # 缓冲区代数：stop() 清空缓冲区时加一，读取方据此判断持有的槽位是否已失效
+        self._generation = 0
+        self._cv = threading.Condition()
+        
+        # 音频帧对象池：消费者通过 release() 归还帧后可复用，避免每帧分配
+        frame_size = config.chunk_size * config.channels
+        self._frame_size = frame_size
+        self._frame_duration = config.chunk_size / config.sample_rate
+        self._frame_pool: List[AudioFrame] = [
+            AudioFrame(np.empty(frame_size, dtype=np.float32), config.sample_rate, config.channels, 0.0, 0, 0.0)
+            for _ in range(buffer_capacity)
+        ]
+        
+        # 零拷贝读取用的帧对象：每个槽位一个，数据为该槽位的只读视图
+        self._view_frames: List[AudioFrame] = []
+        for slot in range(buffer_capacity):
+            view = self._ring[slot]
+            view.flags.writeable = False
+            self._view_frames.append(
+                AudioFrame(view, config.sample_rate, config.channels, 0.0, 0, self._frame_duration)
+            )
         
         # 预处理器
         self._preprocessor: Optional[AudioPreprocessor] = None
@@ -55,12 +83,28 @@ class AudioRecorder:
         
         # 异步回调
         self._async_callback: Optional[Callable[[AudioFrame], None]] = None
+        self._async_zero_copy = False
         self._callback_thread: Optional[threading.Thread] = None
         self._callback_running = False
         
-        # 统计信息
-        self._total_level = 0.0
+        # 事件分发线程：音频回调只投递事件标记，监听器在该线程中执行
+        self._event_queue: deque = deque()
+        self._event_queue_size = buffer_capacity
+        self._event_cv = threading.Condition()
+        self._dispatch_thread: Optional[threading.Thread] = None
+        self._dispatch_running = False
+        
+        # 统计信息（音量按原始采样的绝对值累加，查询时再换算为归一化均值）
+        self._total_level = 0
         self._level_count = 0
+        if config.format == 'int16':
+            self._level_scale = 32768.0
+            self._level_buf = np.empty((config.chunk_size, config.channels), dtype=np.int32)
+            self._level_sum_dtype = np.int64
+        else:
+            self._level_scale = 1.0
+            self._level_buf = np.empty((config.chunk_size, config.channels), dtype=np.float32)
+            self._level_sum_dtype = np.float64
         
         # 验证设备
         self._device_info = self._get_device_info()
@@ -76,50 +120,182 @@ class AudioRecorder:
         except Exception as e:
             raise AudioDeviceError(f"Failed to query device: {e}")
     
-    def _audio_callback(self, indata, frames, time_info, status):
-        """音频回调函数（在独立线程中调用）"""
-        if status:
-            self._trigger_event('error', Exception(f"Audio stream status: {status}"))
+    def _make_audio_callback(self) -> Callable:
+        """
+        生成音频回调函数（在 start() 时调用）
         
-        try:
-            # 复制数据并归一化
-            audio_data = indata.copy().flatten()
+        录音期间不变的量（采样格式、缓冲区、归一化方式）在这里一次性绑定为
+        局部变量，回调中不再做格式判断和属性查找。
+        """
+        ring = self._ring
+        ring_timestamps = self._ring_timestamps
+        ring_frame_ids = self._ring_frame_ids
+        capacity = self._capacity
+        cv = self._cv
+        level_buf = self._level_buf
+        level_dtype = level_buf.dtype
+        level_sum_dtype = self._level_sum_dtype
+        listeners = self._event_listeners
+        post_event = self._post_event
+        
+        if self.config.format == 'int16':
+            # 写入时归一化到-1.0到1.0范围
+            scale = self._INT16_SCALE
             
-            # 如果是int16格式，归一化到-1.0到1.0范围
-            if self.config.format == 'int16':
-                audio_data = audio_data.astype(np.float32) / 32768.0
-            elif audio_data.dtype != np.float32:
-                audio_data = audio_data.astype(np.float32)
+            def write_slot(slot, audio_data):
+                np.multiply(audio_data, scale, out=ring[slot], casting='unsafe')
+        else:
+            def write_slot(slot, audio_data):
+                np.copyto(ring[slot], audio_data, casting='unsafe')
+        
+        def audio_callback(indata, frames, time_info, status):
+            """
+            音频回调函数（在 PortAudio 实时线程中调用）
             
-            # 创建音频帧
-            frame = AudioFrame.create(
-                data=audio_data,
-                sample_rate=self.config.sample_rate,
-                channels=self.config.channels,
-                frame_id=self._frame_id
-            )
+            只做数据拷贝和计数，事件通过 _event_queue 交给分发线程处理
+            """
+            if status:
+                post_event('error', Exception(f"Audio stream status: {status}"))
             
-            # 预处理
-            if self._preprocessor:
-                frame = self._preprocessor.process(frame)
+            try:
+                # 展平为一维视图（不拷贝），唯一的一次拷贝发生在写入环形缓冲区时
+                audio_data = indata.reshape(-1)
+                
+                # 计算音量：直接在原始数据上求绝对值和，int16 在整数域累加
+                np.abs(indata, out=level_buf, dtype=level_dtype)
+                self._total_level += level_buf.sum(dtype=level_sum_dtype).item()
+                self._level_count += indata.size
+                
+                # 写入环形缓冲区
+                with cv:
+                    if self._tail - self._head >= capacity:
+                        self._dropped_frames += 1
+                        overflow = True
+                    else:
+                        slot = self._tail % capacity
+                        write_slot(slot, audio_data)
+                        frame_id = self._frame_id
+                        ring_timestamps[slot] = time.time()
+                        ring_frame_ids[slot] = frame_id
+                        self._tail += 1
+                        self._frame_id = frame_id + 1
+                        self._frames_captured += 1
+                        cv.notify()
+                        overflow = False
+                
+                if overflow:
+                    post_event('overflow')
+                elif listeners.get('data'):
+                    post_event('data', (slot, frame_id))
             
-            # 计算音量
-            level = np.abs(frame.data).mean()
-            self._total_level += level
-            self._level_count += 1
+            except Exception as e:
+                post_event('error', e)
+        
+        return audio_callback
+    
+    def _post_event(self, event: str, arg=None):
+        """从音频回调线程投递事件（队列满时丢弃）"""
+        with self._event_cv:
+            if len(self._event_queue) < self._event_queue_size:
+                self._event_queue.append((event, arg))
+                self._event_cv.notify()
+    
+    def _event_dispatch_worker(self):
+        """事件分发工作线程"""
+        while self._dispatch_running or self._event_queue:
+            with self._event_cv:
+                self._event_cv.wait_for(
+                    lambda: self._event_queue or not self._dispatch_running, timeout=0.1
+                )
+                if not self._event_queue:
+                    continue
+                event, arg = self._event_queue.popleft()
             
-            # 放入缓冲区
-            try:
-                self._buffer.put_nowait(frame)
-                self._frame_id += 1
-                self._frames_captured += 1
+            if event == 'data':
+                slot, frame_id = arg
+                with self._cv:
+                    # 该槽位可能已被消费并被新数据覆盖，此时跳过
+                    if self._ring_frame_ids[slot] != frame_id:
+                        continue
+                    frame = self._make_frame(slot)
+                if self._preprocessor:
+                    frame = self._preprocessor.process(frame)
                 self._trigger_event('data', frame)
-            except queue.Full:
-                self._dropped_frames += 1
+            elif event == 'overflow':
                 self._trigger_event('overflow')
+            else:
+                self._trigger_event(event, arg)
+    
+    def _make_frame(self, slot: int) -> AudioFrame:
+        """从环形缓冲区的指定位置构造音频帧（拷贝数据，优先复用对象池）"""
+        if self._frame_pool:
+            frame = self._frame_pool.pop()
+            np.copyto(frame.data, self._ring[slot])
+            frame.timestamp = float(self._ring_timestamps[slot])
+            frame.frame_id = int(self._ring_frame_ids[slot])
+            frame.duration = self._frame_duration
+            return frame
+        
+        return AudioFrame(
+            data=self._ring[slot].copy(),
+            sample_rate=self.config.sample_rate,
+            channels=self.config.channels,
+            timestamp=float(self._ring_timestamps[slot]),
+            frame_id=int(self._ring_frame_ids[slot]),
+            duration=self._frame_duration
+        )
+    
+    def _pop_frame(self, timeout: Optional[float]) -> Optional[AudioFrame]:
+        """
+        从环形缓冲区取出一帧
+        
+        Args:
+            timeout: 超时时间(秒)，None=永久等待
+            
+        Returns:
+            音频帧，超时返回 None
+        """
+        with self._cv:
+            if not self._cv.wait_for(lambda: self._tail > self._head, timeout):
+                return None
+            slot = self._head % self._capacity
+            frame = self._make_frame(slot)
+            self._head += 1
+        
+        # 预处理（在消费线程中执行，不占用音频回调线程）
+        if self._preprocessor:
+            frame = self._preprocessor.process(frame)
+        return frame
+    
+    def _deliver_frame_view(self, callback: Callable[[AudioFrame], None], timeout: Optional[float]):
+        """
+        以零拷贝方式将队首一帧交给回调
+        
+        帧数据是环形缓冲区槽位的只读视图，回调返回后才推进读位置；
+        在此之前写入方不会覆盖该槽位（缓冲区满时丢弃新帧）。
+        
+        Args:
+            callback: 音频帧回调函数
+            timeout: 超时时间(秒)，None=永久等待
+        """
+        with self._cv:
+            if not self._cv.wait_for(lambda: self._tail > self._head, timeout):
+                return
+            slot = self._head % self._capacity
+            frame = self._view_frames[slot]
+            frame.timestamp = float(self._ring_timestamps[slot])
+            frame.frame_id = int(self._ring_frame_ids[slot])
+            generation = self._generation
         
+        try:
+            callback(frame)
         except Exception as e:
             self._trigger_event('error', e)
+        finally:
+            with self._cv:
+                # 回调期间录音被停止时缓冲区已清空，不再推进读位置
+                if self._generation == generation:
+                    self._head += 1
     
     def start(self) -> bool:
         """
@@ -143,8 +319,16 @@ class AudioRecorder:
                 samplerate=self.config.sample_rate,
                 blocksize=self.config.chunk_size,
                 dtype=dtype,
-                callback=self._audio_callback
+                callback=self._make_audio_callback()
+            )
+            
+            # 启动事件分发线程
+            self._dispatch_running = True
+            self._dispatch_thread = threading.Thread(
+                target=self._event_dispatch_worker,
+                daemon=True
             )
+            self._dispatch_thread.start()
             
             # 启动流
             self._stream.start()
@@ -154,7 +338,7 @@ class AudioRecorder:
             self._frame_id = 0
             self._frames_captured = 0
             self._dropped_frames = 0
-            self._total_level = 0.0
+            self._total_level = 0
             self._level_count = 0
             
             # 启动异步回调线程
@@ -197,14 +381,20 @@ class AudioRecorder:
                 self._stream.close()
                 self._stream = None
             
+            # 停止事件分发线程（线程会先处理完已投递的事件）
+            if self._dispatch_thread:
+                with self._event_cv:
+                    self._dispatch_running = False
+                    self._event_cv.notify()
+                self._dispatch_thread.join(timeout=1.0)
+                self._dispatch_thread = None
+            
             self._is_recording = False
             
-            # 清空缓冲区
-            while not self._buffer.empty():
-                try:
-                    self._buffer.get_nowait()
-                except queue.Empty:
-                    break
+            # 清空缓冲区（仍持有槽位的读取方见代数变化后不再推进读位置）
+            with self._cv:
+                self._head = self._tail = 0
+                self._generation += 1
             
             self._trigger_event('stop')
             return True
@@ -230,11 +420,28 @@ class AudioRecorder:
         if not self._is_recording:
             raise RecorderNotStartedError("Recorder is not started")
         
-        try:
-            frame = self._buffer.get(timeout=timeout)
-            return frame
-        except queue.Empty:
+        frame = self._pop_frame(timeout)
+        if frame is None:
             raise TimeoutError("Timeout waiting for audio data")
+        return frame
+    
+    def release(self, frame: AudioFrame):
+        """
+        归还不再使用的音频帧，供后续读取复用
+        
+        调用后不得再访问该帧及其数据。未归还的帧由垃圾回收正常释放。
+        
+        Args:
+            frame: 由 read()/stream()/read_async 得到的音频帧
+        """
+        data = frame.data
+        if (len(self._frame_pool) < self._capacity
+                and data.dtype == np.float32
+                and data.shape == (self._frame_size,)
+                and data.flags.owndata):
+            frame.sample_rate = self.config.sample_rate
+            frame.channels = self.config.channels
+            self._frame_pool.append(frame)
     
     def stream(self) -> Iterator[AudioFrame]:
         """
@@ -244,22 +451,70 @@ class AudioRecorder:
             音频帧
         """
         while self._is_recording:
-            try:
-                frame = self.read(timeout=1.0)
+            frame = self._pop_frame(timeout=1.0)
+            if frame is not None:
                 yield frame
-            except TimeoutError:
-                continue
-            except RecorderNotStartedError:
-                break
     
-    def read_async(self, callback: Callable[[AudioFrame], None]):
+    def stream_batches(self, window_s: float) -> Iterator[np.ndarray]:
+        """
+        以生成器方式按固定时长窗口读取音频流
+        
+        窗口未跨越环形缓冲区末尾时直接返回缓冲区视图（不拷贝），
+        该视图只在下一次迭代前有效；需要长期保留时请自行 copy()。
+        批数据为归一化后的原始采样，不经过预处理器。
+        
+        Args:
+            window_s: 窗口时长(秒)
+            
+        Yields:
+            一维 float32 音频数据（多声道为交错排列）
+            
+        Raises:
+            ConfigError: 窗口超过缓冲区容量
+        """
+        frames_per_window = max(1, int(window_s * self.config.sample_rate / self.config.chunk_size))
+        if frames_per_window > self._capacity:
+            raise ConfigError(
+                f"window_s={window_s} exceeds buffer capacity ({self.config.buffer_size}s)"
+            )
+        
+        while self._is_recording:
+            with self._cv:
+                if not self._cv.wait_for(
+                    lambda: self._tail - self._head >= frames_per_window, timeout=1.0
+                ):
+                    continue
+                start = self._head % self._capacity
+                generation = self._generation
+            
+            end = start + frames_per_window
+            if end <= self._capacity:
+                batch = self._ring[start:end].reshape(-1)
+            else:
+                batch = np.concatenate(
+                    (self._ring[start:], self._ring[:end - self._capacity])
+                ).reshape(-1)
+            
+            yield batch
+            
+            # 消费者处理完毕后再释放这些槽位，保证视图在此之前不被覆盖；
+            # 期间录音被停止（缓冲区已清空）时不再推进，避免读位置超过写位置
+            with self._cv:
+                if self._generation == generation:
+                    self._head += frames_per_window
+    
+    def read_async(self, callback: Callable[[AudioFrame], None], zero_copy: bool = False):
         """
         注册回调函数，异步接收音频数据
         
         Args:
             callback: 音频帧回调函数
+            zero_copy: 是否零拷贝传递帧数据。开启后帧数据是环形缓冲区的只读视图，
+                       仅在回调执行期间有效，需要保留时应自行拷贝；
+                       设置了预处理器时仍按拷贝方式传递
         """
         self._async_callback = callback
+        self._async_zero_copy = zero_copy
         
         # 如果已经在录音，启动回调线程
         if self._is_recording and not self._callback_running:
@@ -273,15 +528,18 @@ class AudioRecorder:
     def _async_callback_worker(self):
         """异步回调工作线程"""
         while self._callback_running and self._is_recording:
-            try:
-                frame = self._buffer.get(timeout=0.1)
-                if self._async_callback:
-                    try:
-                        self._async_callback(frame)
-                    except Exception as e:
-                        self._trigger_event('error', e)
-            except queue.Empty:
+            if self._async_zero_copy and not self._preprocessor:
+                self._deliver_frame_view(self._async_callback, timeout=0.1)
                 continue
+            
+            frame = self._pop_frame(timeout=0.1)
+            if frame is None:
+                continue
+            if self._async_callback:
+                try:
+                    self._async_callback(frame)
+                except Exception as e:
+                    self._trigger_event('error', e)
     
     def is_recording(self) -> bool:
         """
@@ -300,8 +558,11 @@ class AudioRecorder:
         Returns:
             状态信息
         """
-        buffer_usage = self._buffer.qsize() / self._buffer.maxsize if self._buffer.maxsize > 0 else 0.0
-        average_level = self._total_level / self._level_count if self._level_count > 0 else 0.0
+        buffer_usage = (self._tail - self._head) / self._capacity if self._capacity > 0 else 0.0
+        average_level = (
+            self._total_level / self._level_count / self._level_scale
+            if self._level_count > 0 else 0.0
+        )
         
         return RecorderStatus(
             is_recording=self._is_recording,
@@ -7,7 +7,7 @@ import numpy as np
 import time
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioConfig:
     """音频配置"""
     sample_rate: int = 16000        # 采样率 (Hz)
@@ -31,7 +31,7 @@ class AudioConfig:
             raise ValueError("buffer_size must be positive")
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioFrame:
     """音频帧数据"""
     data: np.ndarray               # 音频数据数组
@@ -69,7 +69,7 @@ class AudioFrame:
         return self.data.nbytes
 
 
-@dataclass
+@dataclass(slots=True)
 class RecorderStatus:
     """录音器状态信息"""
     is_recording: bool             # 是否正在录音
@@ -80,7 +80,7 @@ class RecorderStatus:
     average_level: float           # 平均音量级别
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioDevice:
     """音频设备信息"""
     index: int                     # 设备索引
@@ -1,10 +1,18 @@
 """
 系统配置管理模块
 """
+import atexit
+import copy
+import threading
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+from functools import cached_property
+
+# 优先使用 libyaml 的 C 实现，不可用时回退到纯 Python 实现
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
 
 
 @dataclass
@@ -31,25 +39,97 @@ class ModuleConfig:
 
 @dataclass
 class Config:
-    """完整配置"""
+    """
+    完整配置
+    
+    各模块配置保存为原始字典，首次访问对应属性时才解析为 ModuleConfig
+    """
     system: SystemConfig
     audio: AudioConfig
-    wakeword: ModuleConfig
-    vad: ModuleConfig
-    asr: ModuleConfig
-    orchestrator: ModuleConfig
-    memory: ModuleConfig
     working_mode: int
+    raw_modules: Dict[str, Any] = field(default_factory=dict, repr=False)
+    
+    @cached_property
+    def wakeword(self) -> ModuleConfig:
+        """唤醒词模块配置"""
+        wakeword_data = self.raw_modules['wakeword']
+        return ModuleConfig(
+            enabled=wakeword_data['enabled'],
+            settings={
+                'models': wakeword_data.get('models', []),
+                'threshold': wakeword_data.get('threshold', 0.5),
+                'cooldown_seconds': wakeword_data.get('cooldown_seconds', 3.0)
+            }
+        )
+    
+    @cached_property
+    def vad(self) -> ModuleConfig:
+        """VAD 模块配置"""
+        vad_data = self.raw_modules['vad']
+        return ModuleConfig(
+            enabled=vad_data['enabled'],
+            settings={
+                'frame_duration_ms': vad_data['frame_duration_ms'],
+                'aggressiveness': vad_data.get('aggressiveness', 2),
+                'silence_timeout_ms': vad_data['silence_timeout_ms'],
+                'pre_speech_buffer_ms': vad_data.get('pre_speech_buffer_ms', 300),
+                'min_speech_duration_ms': vad_data.get('min_speech_duration_ms', 300),
+                'min_volume_threshold': vad_data.get('min_volume_threshold', 0.01)
+            }
+        )
+    
+    @cached_property
+    def asr(self) -> ModuleConfig:
+        """ASR 模块配置"""
+        asr_data = self.raw_modules['asr']
+        return ModuleConfig(
+            enabled=asr_data['enabled'],
+            settings={
+                'model': asr_data['model'],
+                'language': asr_data['language'],
+                'size': asr_data.get('size', 'base'),
+                'min_audio_duration_ms': asr_data.get('min_audio_duration_ms', 500),
+                'chunk_duration': asr_data.get('chunk_duration', 0.0)
+            }
+        )
+    
+    @cached_property
+    def orchestrator(self) -> ModuleConfig:
+        """Orchestrator 模块配置"""
+        orchestrator_data = self.raw_modules.get('orchestrator', {})
+        return ModuleConfig(
+            enabled=orchestrator_data.get('enabled', True),
+            settings={
+                'use_mock_llm': orchestrator_data.get('use_mock_llm', True),
+                'default_agent': orchestrator_data.get('default_agent', 'chat_agent')
+            }
+        )
+    
+    @cached_property
+    def memory(self) -> ModuleConfig:
+        """Memory 模块配置"""
+        memory_data = self.raw_modules.get('memory', {})
+        return ModuleConfig(
+            enabled=memory_data.get('enabled', True),
+            settings={
+                'max_short_term': memory_data.get('max_short_term', 100),
+                'long_term_generation': memory_data.get('long_term_generation', {
+                    'trigger_count': 10,
+                    'max_history_rounds': 30
+                })
+            }
+        )
     
     @property
     def is_wakeword_enabled(self) -> bool:
         """是否启用唤醒词"""
-        return self.wakeword.enabled and self.working_mode in [1]
+        # 先判断工作模式，模式不需要时不解析唤醒词配置
+        return self.working_mode in [1] and self.wakeword.enabled
     
     @property
     def is_vad_enabled(self) -> bool:
         """是否启用VAD"""
-        return self.vad.enabled and self.working_mode in [1, 2]
+        return self.working_mode in [1, 2] and self.vad.enabled
     
     @property
     def is_asr_enabled(self) -> bool:
@@ -72,6 +152,15 @@ class Config:
 class ConfigManager:
     """配置管理器"""
     
+    # 修改后延迟写盘的时间(秒)，期间的连续修改合并为一次写入
+    FLUSH_DELAY = 0.5
+    
+    # 可按名称访问的模块配置（与 Config 上的属性同名）
+    _MODULE_NAMES = frozenset({'wakeword', 'vad', 'asr', 'orchestrator', 'memory'})
+    
+    # 已解析配置缓存: 文件路径 -> ((修改时间ns, 文件大小), 原始字典)
+    _parse_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+    
     def __init__(self, config_path: Optional[str] = None):
         """
         初始化配置管理器
@@ -87,93 +176,51 @@ class ConfigManager:
         
         self.config_path = Path(config_path)
         self.config = self.load_config()
+        
+        # 修改先记录在内存中，由 flush() 统一写盘
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+        atexit.register(self.flush)
     
     def load_config(self) -> Config:
         """加载配置文件"""
         if not self.config_path.exists():
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
         
-        with open(self.config_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-        
-        # 解析配置
-        system = SystemConfig(
-            name=data['system']['name'],
-            version=data['system']['version']
-        )
-        
-        audio = AudioConfig(
-            sample_rate=data['audio']['sample_rate'],
-            channels=data['audio']['channels'],
-            chunk_size=data['audio']['chunk_size']
-        )
-        
-        # 模块配置
-        wakeword = ModuleConfig(
-            enabled=data['modules']['wakeword']['enabled'],
-            settings={
-                'models': data['modules']['wakeword'].get('models', []),
-                'threshold': data['modules']['wakeword'].get('threshold', 0.5),
-                'cooldown_seconds': data['modules']['wakeword'].get('cooldown_seconds', 3.0)
-            }
-        )
-        
-        vad = ModuleConfig(
-            enabled=data['modules']['vad']['enabled'],
-            settings={
-                'frame_duration_ms': data['modules']['vad']['frame_duration_ms'],
-                'aggressiveness': data['modules']['vad'].get('aggressiveness', 2),
-                'silence_timeout_ms': data['modules']['vad']['silence_timeout_ms'],
-                'pre_speech_buffer_ms': data['modules']['vad'].get('pre_speech_buffer_ms', 300),
-                'min_speech_duration_ms': data['modules']['vad'].get('min_speech_duration_ms', 300),
-                'min_volume_threshold': data['modules']['vad'].get('min_volume_threshold', 0.01)
-            }
-        )
-        
-        asr = ModuleConfig(
-            enabled=data['modules']['asr']['enabled'],
-            settings={
-                'model': data['modules']['asr']['model'],
-                'language': data['modules']['asr']['language'],
-                'size': data['modules']['asr'].get('size', 'base'),
-                'min_audio_duration_ms': data['modules']['asr'].get('min_audio_duration_ms', 500)
-            }
-        )
-        
-        # Orchestrator配置
-        orchestrator_data = data['modules'].get('orchestrator', {})
-        orchestrator = ModuleConfig(
-            enabled=orchestrator_data.get('enabled', True),
-            settings={
-                'use_mock_llm': orchestrator_data.get('use_mock_llm', True),
-                'default_agent': orchestrator_data.get('default_agent', 'chat_agent')
-            }
-        )
+        # 文件未变化时直接复用已解析的配置
+        cache_key = str(self.config_path.resolve())
+        stat = self.config_path.stat()
+        file_version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._parse_cache.get(cache_key)
+        if cached is not None and cached[0] == file_version:
+            # 只复制原始字典，比深拷贝整个 Config 数据类树便宜得多
+            return self._build_config(copy.deepcopy(cached[1]))
         
-        # Memory配置
-        memory_data = data['modules'].get('memory', {})
-        memory = ModuleConfig(
-            enabled=memory_data.get('enabled', True),
-            settings={
-                'max_short_term': memory_data.get('max_short_term', 100),
-                'long_term_generation': memory_data.get('long_term_generation', {
-                    'trigger_count': 10,
-                    'max_history_rounds': 30
-                })
-            }
-        )
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            data = yaml.load(f, Loader=_YamlLoader)
         
-        working_mode = data.get('working_mode', 3)
+        self._parse_cache[cache_key] = (file_version, copy.deepcopy(data))
+        return self._build_config(data)
+    
+    @staticmethod
+    def _build_config(data: Dict[str, Any]) -> Config:
+        """由 YAML 原始字典构建 Config（各段只查找一次）"""
+        system_data = data['system']
+        audio_data = data['audio']
         
         return Config(
-            system=system,
-            audio=audio,
-            wakeword=wakeword,
-            vad=vad,
-            asr=asr,
-            orchestrator=orchestrator,
-            memory=memory,
-            working_mode=working_mode
+            system=SystemConfig(
+                name=system_data['name'],
+                version=system_data['version']
+            ),
+            audio=AudioConfig(
+                sample_rate=audio_data['sample_rate'],
+                channels=audio_data['channels'],
+                chunk_size=audio_data['chunk_size']
+            ),
+            working_mode=data.get('working_mode', 3),
+            raw_modules=data['modules']
         )
     
     def save_config(self):
@@ -204,13 +251,41 @@ class ConfigManager:
                 'orchestrator': {
                     'enabled': self.config.orchestrator.enabled,
                     **self.config.orchestrator.settings
+                },
+                'memory': {
+                    'enabled': self.config.memory.enabled,
+                    **self.config.memory.settings
                 }
             },
             'working_mode': self.config.working_mode
         }
         
         with open(self.config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, allow_unicode=True, default_flow_style=False)
+            yaml.dump(data, f, Dumper=_YamlDumper, allow_unicode=True, default_flow_style=False)
+        
+        # 文件已改写，丢弃旧的解析结果
+        self._parse_cache.pop(str(self.config_path.resolve()), None)
+    
+    def flush(self):
+        """如果有未保存的修改，立即写入配置文件"""
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            self.save_config()
+            self._dirty = False
+    
+    def _mark_dirty(self):
+        """标记配置已修改，并（重新）安排延迟写盘"""
+        with self._flush_lock:
+            self._dirty = True
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
     
     def set_working_mode(self, mode: int):
         """
@@ -223,61 +298,55 @@ class ConfigManager:
             raise ValueError("Invalid working mode. Must be 1, 2, or 3")
         
         self.config.working_mode = mode
-        self.save_config()
+        self._mark_dirty()
     
     def enable_module(self, module_name: str, enabled: bool = True):
         """
         启用/禁用模块
         
         Args:
-            module_name: 模块名称 ('wakeword', 'vad', 'asr')
+            module_name: 模块名称 ('wakeword', 'vad', 'asr', 'orchestrator', 'memory')
             enabled: 是否启用
         """
-        if module_name == 'wakeword':
-            self.config.wakeword.enabled = enabled
-        elif module_name == 'vad':
-            self.config.vad.enabled = enabled
-        elif module_name == 'asr':
-            self.config.asr.enabled = enabled
-        else:
-            raise ValueError(f"Unknown module: {module_name}")
-        
-        self.save_config()
+        self.get_module_config(module_name).enabled = enabled
+        self._mark_dirty()
     
     def get_module_config(self, module_name: str) -> ModuleConfig:
         """获取模块配置"""
-        if module_name == 'wakeword':
-            return self.config.wakeword
-        elif module_name == 'vad':
-            return self.config.vad
-        elif module_name == 'asr':
-            return self.config.asr
-        else:
+        if module_name not in self._MODULE_NAMES:
             raise ValueError(f"Unknown module: {module_name}")
+        return getattr(self.config, module_name)
     
     def print_config(self):
         """打印当前配置"""
-        print(f"=== {self.config.system.name} v{self.config.system.version} ===")
-        print(f"\n工作模式: {self.config.pipeline_description}")
-        print(f"\n音频配置:")
-        print(f"  采样率: {self.config.audio.sample_rate} Hz")
-        print(f"  声道数: {self.config.audio.channels}")
-        print(f"  块大小: {self.config.audio.chunk_size}")
-        print(f"\n模块状态:")
-        print(f"  唤醒词: {'✅ 启用' if self.config.is_wakeword_enabled else '❌ 禁用'}")
-        print(f"  VAD:   {'✅ 启用' if self.config.is_vad_enabled else '❌ 禁用'}")
-        print(f"  ASR:   {'✅ 启用' if self.config.is_asr_enabled else '❌ 禁用'}")
+        config = self.config
+        lines = [
+            f"=== {config.system.name} v{config.system.version} ===",
+            f"\n工作模式: {config.pipeline_description}",
+            "\n音频配置:",
+            f"  采样率: {config.audio.sample_rate} Hz",
+            f"  声道数: {config.audio.channels}",
+            f"  块大小: {config.audio.chunk_size}",
+            "\n模块状态:",
+            f"  唤醒词: {'✅ 启用' if config.is_wakeword_enabled else '❌ 禁用'}",
+            f"  VAD:   {'✅ 启用' if config.is_vad_enabled else '❌ 禁用'}",
+            f"  ASR:   {'✅ 启用' if config.is_asr_enabled else '❌ 禁用'}",
+        ]
+        print("\n".join(lines))
 
 
 # 全局配置实例
 _config_manager: Optional[ConfigManager] = None
+_config_manager_lock = threading.Lock()
 
 
 def get_config_manager(config_path: Optional[str] = None) -> ConfigManager:
-    """获取全局配置管理器实例"""
+    """获取全局配置管理器实例（线程安全，双重检查加锁）"""
     global _config_manager
     if _config_manager is None:
-        _config_manager = ConfigManager(config_path)
+        with _config_manager_lock:
+            if _config_manager is None:
+                _config_manager = ConfigManager(config_path)
     return _config_manager
 
 
@@ -4,16 +4,21 @@
 负责管理所有模块的生命周期、事件分发和状态协调
 采用中介者模式，模块间不直接通信，所有通信通过控制器进行
 """
-from typing import Dict, List, Callable, Optional, Any
-from collections import defaultdict, deque
+from typing import Dict, List, Callable, Optional, Any, Tuple, Set
+from collections import deque
+import itertools
 import threading
 import time
 
 from .interfaces import IModule
-from .events import Event, EventType
+from .events import Event, EventType, StateChangePayload
 from ..state_machine import VoiceStateManager, StateConfig, StateEvent, VoiceState
 
 
+def _silent(*args, **kwargs):
+    """非调试模式下的空输出函数"""
+
+
 class SystemController:
     """
     系统总控制器 - 中央总线
@@ -32,6 +37,9 @@ class SystemController:
     - GUI只负责展示，不包含业务逻辑
     """
     
+    # 状态超时检查间隔(秒)
+    TIMEOUT_CHECK_INTERVAL = 0.1
+    
     def __init__(self, debug: bool = False):
         """
         初始化系统控制器
@@ -41,11 +49,23 @@ class SystemController:
         """
         self.debug = debug
         
+        # 调试输出：非调试模式下绑定为空函数，热路径上省去 if self.debug 分支
+        self._debug_log: Callable[..., None] = print if debug else _silent
+        
         # 模块注册表
         self._modules: Dict[str, IModule] = {}
         
-        # 事件订阅表 {EventType: [callback1, callback2, ...]}
-        self._event_subscribers: Dict[EventType, List[Callable]] = defaultdict(list)
+        # 模块快照（注册/注销时重建），事件分发时直接遍历
+        self._modules_tuple: Tuple[IModule, ...] = ()
+        
+        # 事件订阅表 [EventType.code] -> (callback1, callback2, ...)
+        # 按事件类型的整数编码下标访问，所有事件类型预置为空元组；
+        # 仅在订阅变化时（持锁）整体替换，发布时无锁读取。
+        # 一次下标访问与事件类型的数量和顺序无关，比按类型逐个比较的分支链更快
+        self._event_subscribers: List[Tuple[Callable, ...]] = [()] * len(EventType)
+        
+        # 订阅去重集合 {EventType.code: {callback1, callback2, ...}}
+        self._subscriber_sets: Dict[int, Set[Callable]] = {}
         
         # 事件队列
         self._event_queue: deque = deque(maxlen=1000)
@@ -57,19 +77,27 @@ class SystemController:
         self._running = False
         self._lock = threading.RLock()
         
+        # 状态超时检查线程（按固定时间间隔检查，与音频帧率解耦）
+        self._timeout_thread: Optional[threading.Thread] = None
+        self._timeout_stop = threading.Event()
+        
         # 统计信息
         self._stats = {
             'events_processed': 0,
+            'audio_frames_processed': 0,
             'events_dropped': 0,
             'errors': 0,
             'start_time': 0
         }
         
+        # 音频帧/事件计数器（next() 在 GIL 下是原子的，发布路径无需加锁）
+        self._audio_frame_counter = itertools.count(1)
+        self._event_counter = itertools.count(1)
+        
         # 评估模式标志（用于禁用TTS等功能）
         self.evaluation_mode = False
         
-        if self.debug:
-            print("🚀 SystemController 初始化完成")
+        self._debug_log("🚀 SystemController 初始化完成")
     
     # ==================== 模块管理 ====================
     
@@ -86,9 +114,9 @@ class SystemController:
                 raise ValueError(f"模块 '{module_name}' 已经注册")
             
             self._modules[module_name] = module
+            self._modules_tuple = tuple(self._modules.values())
             
-            if self.debug:
-                print(f"📦 注册模块: {module_name}")
+            self._debug_log(f"📦 注册模块: {module_name}")
     
     def unregister_module(self, module_name: str):
         """
@@ -104,9 +132,9 @@ class SystemController:
                     module.stop()
                 module.cleanup()
                 del self._modules[module_name]
+                self._modules_tuple = tuple(self._modules.values())
                 
-                if self.debug:
-                    print(f"📤 注销模块: {module_name}")
+                self._debug_log(f"📤 注销模块: {module_name}")
     
     def get_module(self, module_name: str) -> Optional[IModule]:
         """获取模块"""
@@ -128,10 +156,9 @@ class SystemController:
         Returns:
             是否全部初始化成功
         """
-        if self.debug:
-            print("\n" + "="*60)
-            print("🔧 开始初始化所有模块")
-            print("="*60)
+        self._debug_log("\n" + "="*60)
+        self._debug_log("🔧 开始初始化所有模块")
+        self._debug_log("="*60)
         
         # 初始化状态机
         if state_config is None:
@@ -143,35 +170,28 @@ class SystemController:
             )
         
         self._state_manager = VoiceStateManager(state_config)
-        if self.debug:
-            print("✅ 状态机初始化成功")
+        self._debug_log("✅ 状态机初始化成功")
         
         # 初始化所有模块
         success = True
         for name, module in self._modules.items():
             try:
-                if self.debug:
-                    print(f"\n初始化模块: {name}")
+                self._debug_log(f"\n初始化模块: {name}")
                 
                 if not module.initialize():
                     print(f"❌ 模块 '{name}' 初始化失败")
                     success = False
                 else:
-                    if self.debug:
-                        print(f"✅ 模块 '{name}' 初始化成功")
+                    self._debug_log(f"✅ 模块 '{name}' 初始化成功")
             except Exception as e:
                 print(f"❌ 模块 '{name}' 初始化异常: {e}")
                 import traceback
                 traceback.print_exc()
                 success = False
         
-        if self.debug:
-            print("\n" + "="*60)
-            if success:
-                print("🎉 所有模块初始化完成")
-            else:
-                print("⚠️ 部分模块初始化失败")
-            print("="*60 + "\n")
+        self._debug_log("\n" + "="*60)
+        self._debug_log("🎉 所有模块初始化完成" if success else "⚠️ 部分模块初始化失败")
+        self._debug_log("="*60 + "\n")
         
         return success
     
@@ -186,24 +206,21 @@ class SystemController:
             print("⚠️ 系统已在运行")
             return False
         
-        if self.debug:
-            print("\n" + "="*60)
-            print("▶️  启动所有模块")
-            print("="*60)
+        self._debug_log("\n" + "="*60)
+        self._debug_log("▶️  启动所有模块")
+        self._debug_log("="*60)
         
         # 启动所有模块
         success = True
         for name, module in self._modules.items():
             try:
-                if self.debug:
-                    print(f"启动模块: {name}")
+                self._debug_log(f"启动模块: {name}")
                 
                 if not module.start():
                     print(f"❌ 模块 '{name}' 启动失败")
                     success = False
                 else:
-                    if self.debug:
-                        print(f"✅ 模块 '{name}' 启动成功")
+                    self._debug_log(f"✅ 模块 '{name}' 启动成功")
             except Exception as e:
                 print(f"❌ 模块 '{name}' 启动异常: {e}")
                 success = False
@@ -211,14 +228,14 @@ class SystemController:
         if success:
             self._running = True
             self._stats['start_time'] = time.time()
+            self._start_timeout_thread()
             
             # 发布系统启动事件
             self.publish_event(Event.create(EventType.SYSTEM_START, "system"))
             
-            if self.debug:
-                print("\n" + "="*60)
-                print("✅ 系统启动成功")
-                print("="*60 + "\n")
+            self._debug_log("\n" + "="*60)
+            self._debug_log("✅ 系统启动成功")
+            self._debug_log("="*60 + "\n")
         
         return success
     
@@ -227,10 +244,9 @@ class SystemController:
         if not self._running:
             return
         
-        if self.debug:
-            print("\n" + "="*60)
-            print("⏹️  停止所有模块")
-            print("="*60)
+        self._debug_log("\n" + "="*60)
+        self._debug_log("⏹️  停止所有模块")
+        self._debug_log("="*60)
         
         # 发布系统停止事件
         self.publish_event(Event.create(EventType.SYSTEM_STOP, "system"))
@@ -239,23 +255,21 @@ class SystemController:
         for name in reversed(list(self._modules.keys())):
             module = self._modules[name]
             try:
-                if self.debug:
-                    print(f"停止模块: {name}")
+                self._debug_log(f"停止模块: {name}")
                 module.stop()
             except Exception as e:
                 print(f"⚠️ 模块 '{name}' 停止异常: {e}")
         
         self._running = False
+        self._stop_timeout_thread()
         
-        if self.debug:
-            print("\n" + "="*60)
-            print("✅ 系统已停止")
-            print("="*60 + "\n")
+        self._debug_log("\n" + "="*60)
+        self._debug_log("✅ 系统已停止")
+        self._debug_log("="*60 + "\n")
     
     def cleanup_all(self):
         """清理所有模块"""
-        if self.debug:
-            print("🧹 清理所有模块")
+        self._debug_log("🧹 清理所有模块")
         
         for name in reversed(list(self._modules.keys())):
             module = self._modules[name]
@@ -264,8 +278,11 @@ class SystemController:
             except Exception as e:
                 print(f"⚠️ 模块 '{name}' 清理异常: {e}")
         
-        self._modules.clear()
-        self._event_subscribers.clear()
+        with self._lock:
+            self._modules.clear()
+            self._modules_tuple = ()
+            self._event_subscribers = [()] * len(EventType)
+            self._subscriber_sets.clear()
         self._event_queue.clear()
     
     # ==================== 事件系统 ====================
@@ -280,14 +297,18 @@ class SystemController:
         """
         with self._lock:
             # 避免重复订阅
-            if callback not in self._event_subscribers[event_type]:
-                self._event_subscribers[event_type].append(callback)
+            type_id = event_type.code
+            callbacks = self._subscriber_sets.setdefault(type_id, set())
+            if callback not in callbacks:
+                callbacks.add(callback)
+                self._set_subscribers(
+                    type_id,
+                    (*self._event_subscribers[type_id], callback)
+                )
                 
-                if self.debug:
-                    print(f"📥 订阅事件: {event_type.value}")
+                self._debug_log(f"📥 订阅事件: {event_type}")
             else:
-                if self.debug:
-                    print(f"⚠️ 重复订阅事件已忽略: {event_type.value}")
+                self._debug_log(f"⚠️ 重复订阅事件已忽略: {event_type}")
     
     def unsubscribe(self, event_type: EventType, callback: Callable[[Event], None]):
         """
@@ -298,42 +319,58 @@ class SystemController:
             callback: 回调函数
         """
         with self._lock:
-            if event_type in self._event_subscribers:
-                if callback in self._event_subscribers[event_type]:
-                    self._event_subscribers[event_type].remove(callback)
+            type_id = event_type.code
+            callbacks = self._subscriber_sets.get(type_id)
+            if callbacks and callback in callbacks:
+                callbacks.discard(callback)
+                self._set_subscribers(
+                    type_id,
+                    tuple(cb for cb in self._event_subscribers[type_id] if cb != callback)
+                )
+    
+    def _set_subscribers(self, type_id: int, subscribers: Tuple[Callable, ...]):
+        """以写时复制方式替换某个事件类型的订阅者元组（调用方需持有 self._lock）"""
+        table = list(self._event_subscribers)
+        table[type_id] = subscribers
+        self._event_subscribers = table
     
     def publish_event(self, event: Event):
         """
         发布事件
         
+        在发布方线程内同步分发，全程不加锁：
+        - 音频帧事件（录音线程，高频）只累加计数，不进入事件队列
+        - 其他事件（各模块线程，低频）追加到事件队列
+        两类事件不共享任何需要加锁的结构，彼此之间没有锁竞争
+        
         Args:
             event: 事件对象
         """
-        with self._lock:
-            # 记录事件
+        if event.type is EventType.AUDIO_FRAME_READY:
+            # 音频帧事件太频繁：不加锁、不记录到事件队列、不打印
+            self._stats['audio_frames_processed'] = next(self._audio_frame_counter)
+        else:
+            # 记录事件：deque.append 与 next(itertools.count) 在 GIL 下都是原子操作，无需加锁
             self._event_queue.append(event)
-            self._stats['events_processed'] += 1
+            self._stats['events_processed'] = next(self._event_counter)
             
-            if self.debug and event.type != EventType.AUDIO_FRAME_READY:
-                # 音频帧事件太频繁，不打印
-                print(f"📡 事件发布: {event}")
+            self._debug_log(f"📡 事件发布: {event}")
         
         # 通知订阅者
-        subscribers = self._event_subscribers.get(event.type, [])
+        subscribers = self._event_subscribers[event.type.code]
         for callback in subscribers:
             try:
                 callback(event)
             except Exception as e:
-                print(f"⚠️ 事件处理异常 [{event.type.value}]: {e}")
+                print(f"⚠️ 事件处理异常 [{event.type}]: {e}")
                 self._stats['errors'] += 1
         
         # 分发到各模块
-        for module in self._modules.values():
+        for module in self._modules_tuple:
             try:
                 module.handle_event(event)
             except Exception as e:
-                if self.debug:
-                    print(f"⚠️ 模块 '{module.name}' 处理事件异常: {e}")
+                self._debug_log(f"⚠️ 模块 '{module.name}' 处理事件异常: {e}")
     
     # ==================== 状态管理 ====================
     
@@ -363,10 +400,9 @@ class SystemController:
         
         if result.success:
             # 发布状态变化事件
-            from .events import StateChangeEvent, StateChangePayload
-            event = StateChangeEvent(
-                source="state_machine",
-                payload=StateChangePayload(
+            event = Event.of(
+                "state_machine",
+                StateChangePayload(
                     from_state=result.previous_state.value,
                     to_state=result.current_state.value,
                     reason=result.message
@@ -391,6 +427,31 @@ class SystemController:
                 # 发布超时事件
                 self.publish_event(Event.create(EventType.WAKEWORD_TIMEOUT, "system"))
     
+    def _start_timeout_thread(self):
+        """启动状态超时检查线程"""
+        self._timeout_stop.clear()
+        self._timeout_thread = threading.Thread(
+            target=self._timeout_worker,
+            name="StateTimeoutChecker",
+            daemon=True
+        )
+        self._timeout_thread.start()
+    
+    def _stop_timeout_thread(self):
+        """停止状态超时检查线程"""
+        self._timeout_stop.set()
+        if self._timeout_thread and self._timeout_thread is not threading.current_thread():
+            self._timeout_thread.join(timeout=1.0)
+        self._timeout_thread = None
+    
+    def _timeout_worker(self):
+        """超时检查线程主循环"""
+        while not self._timeout_stop.wait(self.TIMEOUT_CHECK_INTERVAL):
+            try:
+                self.check_timeout()
+            except Exception as e:
+                print(f"⚠️ 超时检查异常: {e}")
+    
     # ==================== 统计信息 ====================
     
     def get_statistics(self) -> dict:
@@ -402,7 +463,7 @@ class SystemController:
             'uptime_seconds': uptime,
             'modules_count': len(self._modules),
             'modules': list(self._modules.keys()),
-            'events_processed': self._stats['events_processed'],
+            'events_processed': self._stats['events_processed'] + self._stats['audio_frames_processed'],
             'events_dropped': self._stats['events_dropped'],
             'errors': self._stats['errors'],
             'event_queue_size': len(self._event_queue),
@@ -413,18 +474,22 @@ class SystemController:
         """打印系统状态"""
         stats = self.get_statistics()
         
-        print("\n" + "="*60)
-        print("📊 系统状态")
-        print("="*60)
-        print(f"运行状态: {'🟢 运行中' if stats['running'] else '🔴 已停止'}")
-        print(f"运行时间: {stats['uptime_seconds']:.1f}秒")
-        print(f"当前状态: {stats['current_state']}")
-        print(f"模块数量: {stats['modules_count']}")
-        print(f"已注册模块: {', '.join(stats['modules'])}")
-        print(f"处理事件: {stats['events_processed']}")
-        print(f"事件队列: {stats['event_queue_size']}")
-        print(f"错误次数: {stats['errors']}")
-        print("="*60 + "\n")
+        # 拼成一个字符串一次输出，避免与其他线程的输出交错
+        lines = [
+            "\n" + "="*60,
+            "📊 系统状态",
+            "="*60,
+            f"运行状态: {'🟢 运行中' if stats['running'] else '🔴 已停止'}",
+            f"运行时间: {stats['uptime_seconds']:.1f}秒",
+            f"当前状态: {stats['current_state']}",
+            f"模块数量: {stats['modules_count']}",
+            f"已注册模块: {', '.join(stats['modules'])}",
+            f"处理事件: {stats['events_processed']}",
+            f"事件队列: {stats['event_queue_size']}",
+            f"错误次数: {stats['errors']}",
+            "="*60 + "\n",
+        ]
+        print("\n".join(lines))
     
     # ==================== 工作流协调 ====================
     
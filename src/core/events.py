@@ -5,15 +5,53 @@
 使用强类型 Payload 确保模块间协议清晰
 """
 from enum import Enum
+from collections import deque
+from functools import lru_cache
+from types import MappingProxyType
 from dataclasses import dataclass, field
-from typing import Any, Optional, Protocol, Dict, List
+from typing import Any, Optional, Protocol, Dict, List, Mapping
+import sys
 import time
 
+from .types import EMPTY_MAPPING
+# 领域数据类型统一定义在 types 中，这里一并导出，事件相关代码只需从本模块导入
+from .types import (  # noqa: F401
+    ShortTermMemory, ShortTermMemoryRecord, LongTermMemory, SystemState, AgentInfo,
+    OrchestratorInput, OrchestratorContext, OrchestratorDecision,
+)
+
+
+# 事件时间戳使用单调时钟（不受系统校时影响，且返回整数无需浮点转换）；
+# 启动时记录与 Unix 时间的偏移，需要墙钟时间时据此换算
+_monotonic_ns = time.monotonic_ns
+_WALL_CLOCK_OFFSET_NS = time.time_ns() - time.monotonic_ns()
+
 
 # ============================================================================
 # 基础枚举定义
 # ============================================================================
 
+def _member_from_code(cls, code: int):
+    """按整数编码取回枚举成员"""
+    return cls._members_by_code[code]
+
+
+def _assign_codes(enum_cls):
+    """
+    为枚举成员按定义顺序分配紧凑的整数编码 member.code
+    
+    序列化（日志帧、跨进程传输）时可写入 code 代替字符串值，读取时用 from_code() 还原。
+    编码依赖定义顺序，新增成员只能追加在末尾。
+    """
+    members = tuple(enum_cls)
+    for code, member in enumerate(members):
+        member.code = code
+    enum_cls._members_by_code = members
+    enum_cls.from_code = classmethod(_member_from_code)
+    return enum_cls
+
+
+@_assign_codes
 class SessionAction(str, Enum):
     """会话操作类型"""
     NEW = "new"           # 新建会话
@@ -25,28 +63,50 @@ class SessionAction(str, Enum):
 # Payload 类定义 - 定义各事件的数据结构
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class AudioFramePayload:
-    """音频帧载荷"""
-    frame_data: bytes
+    """
+    音频帧载荷
+    
+    frame_data 可能是录音环形缓冲区的只读视图（零拷贝），只在事件回调期间有效；
+    需要在回调之外保留音频数据的订阅者应自行拷贝
+    """
+    frame_data: Any                 # 音频数据（bytes 或 numpy 数组/视图）
     sample_rate: int
     channels: int = 1
     
-    def to_dict(self) -> Dict[str, Any]:
-        return {
+    @property
+    def frame_size(self) -> int:
+        """帧数据长度（访问时才计算）"""
+        return len(self.frame_data)
+    
+    def to_dict(self, include_frame_size: bool = True) -> Dict[str, Any]:
+        """
+        转换为字典
+        
+        载荷会随事件对象池复用，字段随时可能被改写，因此不缓存结果；
+        不需要帧长度的调用方可传 include_frame_size=False 省去计算
+        """
+        result = {
             'frame_data': self.frame_data,
             'sample_rate': self.sample_rate,
             'channels': self.channels,
-            'frame_size': len(self.frame_data)
         }
+        if include_frame_size:
+            result['frame_size'] = len(self.frame_data)
+        return result
 
 
-@dataclass
+@dataclass(slots=True)
 class WakewordPayload:
     """唤醒词载荷"""
     keyword: str
     confidence: float
     
+    def __post_init__(self):
+        if self.keyword:
+            self.keyword = sys.intern(self.keyword)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             'keyword': self.keyword,
@@ -54,7 +114,7 @@ class WakewordPayload:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class VADPayload:
     """VAD事件载荷"""
     audio_data: Optional[bytes] = None
@@ -70,7 +130,7 @@ class VADPayload:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ASRPayload:
     """ASR识别载荷"""
     text: str
@@ -89,13 +149,18 @@ class ASRPayload:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class StateChangePayload:
     """状态变化载荷"""
     from_state: str
     to_state: str
     reason: str = ""
     
+    def __post_init__(self):
+        # 状态名来自固定集合，驻留后各事件共享同一字符串对象（reason 为自由文本，不驻留）
+        self.from_state = sys.intern(self.from_state)
+        self.to_state = sys.intern(self.to_state)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             'from_state': self.from_state,
@@ -104,26 +169,30 @@ class StateChangePayload:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentRequestPayload:
     """Agent请求载荷"""
     agent_name: str
     query: str
-    context: Dict[str, Any] = field(default_factory=dict)
+    context: Mapping[str, Any] = field(default_factory=lambda: EMPTY_MAPPING)
     decision: Optional[Dict[str, Any]] = None
     
+    def __post_init__(self):
+        if self.agent_name:
+            self.agent_name = sys.intern(self.agent_name)
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             'agent_name': self.agent_name,
             'query': self.query,
-            'context': self.context,
+            'context': dict(self.context),
             'decision': self.decision
         }
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SessionInfo:
-    """会话信息"""
+    """会话信息（不可变，相同会话的事件共享同一实例）"""
     session_id: str
     session_action: SessionAction = SessionAction.NEW
     priority: Optional[int] = None
@@ -138,6 +207,13 @@ class SessionInfo:
         return result
 
 
+@lru_cache(maxsize=1024)
+def _session_info(session_id: str, session_action: SessionAction) -> SessionInfo:
+    """按 (会话ID, 会话操作) 缓存 SessionInfo，同一会话的多个事件不再重复创建"""
+    return SessionInfo(session_id=session_id, session_action=session_action)
+
+
+@_assign_codes
 class AgentStatus(str, Enum):
     """Agent响应状态"""
     WAITING_INPUT = "waiting_input"  # 等待用户输入（会话Agent）
@@ -145,7 +221,7 @@ class AgentStatus(str, Enum):
     ERROR = "error"                  # 执行出错
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentResponsePayload:
     """
     Agent响应载荷
@@ -163,6 +239,19 @@ class AgentResponsePayload:
     status: AgentStatus                 # 状态
     data: Optional[Dict[str, Any]] = None  # 额外的业务数据
     
+    # 状态判断结果，构造时计算一次（响应创建后不再修改 status）
+    _is_waiting: bool = field(init=False, repr=False, compare=False)
+    _is_completed: bool = field(init=False, repr=False, compare=False)
+    _is_error: bool = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.agent:
+            self.agent = sys.intern(self.agent)
+        status = self.status
+        self._is_waiting = status == AgentStatus.WAITING_INPUT
+        self._is_completed = status == AgentStatus.COMPLETED
+        self._is_error = status == AgentStatus.ERROR
+    
     def to_dict(self) -> Dict[str, Any]:
         result = {
             'agent': self.agent,
@@ -177,19 +266,19 @@ class AgentResponsePayload:
     @property
     def success(self) -> bool:
         """判断是否成功"""
-        return self.status == AgentStatus.COMPLETED
+        return self._is_completed
     
     def is_waiting_input(self) -> bool:
         """判断是否等待用户输入"""
-        return self.status == AgentStatus.WAITING_INPUT
+        return self._is_waiting
     
     def is_completed(self) -> bool:
         """判断是否完成"""
-        return self.status == AgentStatus.COMPLETED
+        return self._is_completed
     
     def is_error(self) -> bool:
         """判断是否有错误"""
-        return self.status == AgentStatus.ERROR
+        return self._is_error
 
 
 # ============================================================================
@@ -197,9 +286,14 @@ class AgentResponsePayload:
 # ============================================================================
 
 
-class EventType(Enum):
+@_assign_codes
+class EventType(str, Enum):
     """系统事件类型"""
     
+    # str()/format() 直接得到事件名（与 value 相同），输出日志时无需再取 .value
+    __str__ = str.__str__
+    __format__ = str.__format__
+    
     # === 系统控制事件 ===
     SYSTEM_START = "system_start"           # 系统启动
     SYSTEM_STOP = "system_stop"             # 系统停止
@@ -245,37 +339,84 @@ class EventType(Enum):
     AGENT_RESPONSE = "agent_response"                  # Agent响应
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """
     事件基类 - 只包含所有事件共有的字段
     
+    事件类使用 __slots__（无实例 __dict__），子类需声明 __slots__
+    
     字段说明：
     - type: 事件类型
     - source: 事件源（模块名）
-    - timestamp: 事件时间戳
+    - timestamp_ns: 事件时间戳（单调时钟，纳秒），用于计算延迟
     - payload: 事件载荷（强类型 Payload 对象，包含该事件的所有业务数据）
     """
     type: EventType                 # 事件类型
     source: str                     # 事件源（模块名）
-    timestamp: float                # 时间戳
+    timestamp_ns: int               # 时间戳（单调时钟，纳秒）
     payload: Optional[Any] = None   # 事件载荷（强类型 Payload 对象）
     
+    def __post_init__(self):
+        # 事件源来自少量固定的模块名，驻留后各事件共享同一字符串对象
+        self.source = sys.intern(self.source)
+    
     @classmethod
     def create(cls, event_type: EventType, source: str, payload: Any = None):
         """创建事件"""
-        return cls(
-            type=event_type,
-            source=source,
-            timestamp=time.time(),
-            payload=payload
-        )
+        return cls._fast_new(event_type, source, _monotonic_ns(), payload)
+    
+    @classmethod
+    def _fast_new(cls, event_type: EventType, source: str, timestamp_ns: int,
+                  payload: Any = None):
+        """直接创建实例并赋值槽位，不经过 dataclass 生成的 __init__"""
+        event = _new_object(cls)
+        event.type = event_type
+        event.source = sys.intern(source)
+        event.timestamp_ns = timestamp_ns
+        event.payload = payload
+        return event
+    
+    @staticmethod
+    def of(source: str, payload: Any, msg_id: Optional[str] = "", *,
+           event_type: Optional[EventType] = None,
+           session_id: Optional[str] = None,
+           session_action: Optional[SessionAction] = None) -> 'Event':
+        """
+        根据载荷创建事件
+        
+        事件类型由载荷类型查表得到；VAD/ASR 等一种载荷对应多个事件类型的需显式传入 event_type。
+        对话类载荷（唤醒词/VAD/ASR/Agent）创建 ConversationEvent 并填充对话追踪字段，其余创建 Event。
+        直接创建实例并赋值槽位，不经过子类构造函数和 dataclass 生成的 __init__。
+        """
+        if event_type is None:
+            event_type = _PAYLOAD_TO_EVENT_TYPE.get(type(payload))
+            if event_type is None:
+                raise ValueError(f"无法根据载荷类型确定事件类型: {type(payload).__name__}")
+        
+        if type(payload) in _CONVERSATION_PAYLOADS:
+            event = _new_object(ConversationEvent)
+            event.msg_id = msg_id
+            event.session_id = session_id
+            event.session_action = session_action
+        else:
+            event = _new_object(Event)
+        event.type = event_type
+        event.source = sys.intern(source)
+        event.timestamp_ns = _monotonic_ns()
+        event.payload = payload
+        return event
+    
+    @property
+    def timestamp(self) -> float:
+        """事件时间（Unix 时间，秒），由单调时间戳换算，供显示和兼容旧接口使用"""
+        return (self.timestamp_ns + _WALL_CLOCK_OFFSET_NS) * 1e-9
     
     def __repr__(self):
-        return f"Event(type={self.type.value}, source={self.source}, timestamp={self.timestamp:.3f})"
+        return f"Event(type={self.type}, source={self.source}, timestamp={self.timestamp:.3f})"
 
 
-@dataclass
+@dataclass(slots=True)
 class ConversationEvent(Event):
     """
     对话事件基类 - 用于处理需要对话上下文的事件
@@ -291,107 +432,199 @@ class ConversationEvent(Event):
     session_id: Optional[str] = None             # 会话ID（会话管理）
     session_action: Optional[SessionAction] = None  # 会话操作类型
     
+    @classmethod
+    def _fast_new(cls, event_type: EventType, source: str, timestamp_ns: int,
+                  payload: Any = None, msg_id: str = "", session_id: Optional[str] = None,
+                  session_action: Optional[SessionAction] = None):
+        """直接创建实例并赋值槽位（含对话追踪字段），不经过 dataclass 生成的 __init__"""
+        event = _new_object(cls)
+        event.type = event_type
+        event.source = sys.intern(source)
+        event.timestamp_ns = timestamp_ns
+        event.payload = payload
+        event.msg_id = msg_id
+        event.session_id = session_id
+        event.session_action = session_action
+        return event
+    
     def get_session_info(self) -> Optional[SessionInfo]:
         """获取会话信息"""
         if self.session_id:
-            return SessionInfo(
-                session_id=self.session_id,
-                session_action=self.session_action or SessionAction.NEW
-            )
+            return _session_info(self.session_id, self.session_action or SessionAction.NEW)
         return None
 
 
+# 事件类型 -> 载荷类型
+# 约定：某类型事件的 payload 总是对应的类型，订阅者按事件类型分发后可直接访问载荷字段，无需 isinstance 检查。
+# 未列出的事件类型没有载荷（payload 为 None）
+PAYLOAD_TYPES: Mapping[EventType, type] = MappingProxyType({
+    EventType.AUDIO_FRAME_READY: AudioFramePayload,
+    EventType.WAKEWORD_DETECTED: WakewordPayload,
+    EventType.VAD_SPEECH_START: VADPayload,
+    EventType.VAD_SPEECH_END: VADPayload,
+    EventType.ASR_RECOGNITION_START: ASRPayload,
+    EventType.ASR_RECOGNITION_SUCCESS: ASRPayload,
+    EventType.ASR_RECOGNITION_FAILED: ASRPayload,
+    EventType.ASR_PARTIAL_RESULT: ASRPayload,
+    EventType.STATE_CHANGED: StateChangePayload,
+    EventType.AGENT_DISPATCH_REQUEST: AgentRequestPayload,
+    EventType.AGENT_RESPONSE: AgentResponsePayload,
+    EventType.GUI_UPDATE_TEXT: dict,
+    EventType.TTS_SPEAK_REQUEST: dict,
+    EventType.TTS_SPEAK_START: dict,
+    EventType.TTS_SPEAK_END: dict,
+    EventType.TTS_SPEAK_ERROR: dict,
+})
+
+# 载荷类型 -> 事件类型（供 Event.of 查表；一种载荷对应多个事件类型的不在表中）
+_PAYLOAD_TO_EVENT_TYPE: Dict[type, EventType] = {
+    AudioFramePayload: EventType.AUDIO_FRAME_READY,
+    WakewordPayload: EventType.WAKEWORD_DETECTED,
+    StateChangePayload: EventType.STATE_CHANGED,
+    AgentRequestPayload: EventType.AGENT_DISPATCH_REQUEST,
+    AgentResponsePayload: EventType.AGENT_RESPONSE,
+}
+
+# 属于对话流程、需要携带 msg_id/会话信息的载荷类型
+_CONVERSATION_PAYLOADS = frozenset({
+    WakewordPayload, VADPayload, ASRPayload, AgentRequestPayload, AgentResponsePayload,
+})
+
+_new_object = object.__new__
+
+
+# 以下事件子类保留用于兼容现有调用方，新代码统一使用 Event.of 创建事件
+# （AudioFrameEvent 另外提供对象池）
+
 class AudioFrameEvent(Event):
-    """音频帧事件"""
+    """
+    音频帧事件
+    
+    音频帧事件发布频率很高，发布方可以用 acquire()/release() 复用事件及其载荷对象：
+    控制器不会保留音频帧事件，订阅者也只在回调中同步读取其字段。
+    """
+    __slots__ = ()
+    
+    # 空闲事件对象池（每个事件连同其 AudioFramePayload 一起复用）
+    _pool: deque = deque(maxlen=64)
     
     def __init__(self, source: str, payload: AudioFramePayload):
-        super().__init__(
-            type=EventType.AUDIO_FRAME_READY,
-            source=source,
-            timestamp=time.time(),
-            payload=payload
-        )
+        # 每帧都会创建，直接赋值槽位，不经过 dataclass 生成的 __init__
+        self.type = EventType.AUDIO_FRAME_READY
+        self.source = source
+        self.timestamp_ns = _monotonic_ns()
+        self.payload = payload
+    
+    @classmethod
+    def acquire(cls, source: str, frame_data: bytes, sample_rate: int,
+                channels: int = 1) -> 'AudioFrameEvent':
+        """从对象池取出一个音频帧事件并填充字段（池为空时新建）"""
+        try:
+            event = cls._pool.pop()
+        except IndexError:
+            return cls(source, AudioFramePayload(frame_data, sample_rate, channels))
+        
+        payload = event.payload
+        payload.frame_data = frame_data
+        payload.sample_rate = sample_rate
+        payload.channels = channels
+        event.source = source
+        event.timestamp_ns = _monotonic_ns()
+        return event
+    
+    def release(self):
+        """将发布完毕的音频帧事件归还对象池（释放对帧数据的引用）"""
+        self.payload.frame_data = b''
+        self._pool.append(self)
 
 
 class WakewordEvent(ConversationEvent):
     """唤醒词事件 - 对话开始事件"""
+    __slots__ = ()
     
     def __init__(self, source: str, payload: WakewordPayload, msg_id: str):
-        super().__init__(
-            type=EventType.WAKEWORD_DETECTED,
-            source=source,
-            timestamp=time.time(),
-            payload=payload,
-            msg_id=msg_id
-        )
+        # 直接赋值槽位，不经过 dataclass 生成的 __init__
+        self.type = EventType.WAKEWORD_DETECTED
+        self.source = sys.intern(source)
+        self.timestamp_ns = _monotonic_ns()
+        self.payload = payload
+        self.msg_id = msg_id
+        self.session_id = None
+        self.session_action = None
 
 
 class VADEvent(ConversationEvent):
     """VAD事件 - 对话中的语音检测事件"""
+    __slots__ = ()
     
     def __init__(self, event_type: EventType, source: str, payload: VADPayload, msg_id: str):
-        super().__init__(
-            type=event_type,
-            source=source,
-            timestamp=time.time(),
-            payload=payload,
-            msg_id=msg_id
-        )
+        # 直接赋值槽位，不经过 dataclass 生成的 __init__
+        self.type = event_type
+        self.source = sys.intern(source)
+        self.timestamp_ns = _monotonic_ns()
+        self.payload = payload
+        self.msg_id = msg_id
+        self.session_id = None
+        self.session_action = None
 
 
 class ASREvent(ConversationEvent):
     """ASR事件 - 对话中的语音识别事件"""
+    __slots__ = ()
     
     def __init__(self, event_type: EventType, source: str, payload: ASRPayload, msg_id: str):
-        super().__init__(
-            type=event_type,
-            source=source,
-            timestamp=time.time(),
-            payload=payload,
-            msg_id=msg_id
-        )
+        # 直接赋值槽位，不经过 dataclass 生成的 __init__
+        self.type = event_type
+        self.source = sys.intern(source)
+        self.timestamp_ns = _monotonic_ns()
+        self.payload = payload
+        self.msg_id = msg_id
+        self.session_id = None
+        self.session_action = None
 
 
 class StateChangeEvent(Event):
     """状态变化事件"""
+    __slots__ = ()
     
     def __init__(self, source: str, payload: StateChangePayload):
-        super().__init__(
-            type=EventType.STATE_CHANGED,
-            source=source,
-            timestamp=time.time(),
-            payload=payload
-        )
+        # 直接赋值槽位，不经过 dataclass 生成的 __init__
+        self.type = EventType.STATE_CHANGED
+        self.source = sys.intern(source)
+        self.timestamp_ns = _monotonic_ns()
+        self.payload = payload
 
 
 
 class AgentRequestEvent(ConversationEvent):
     """Agent请求事件 - 对话相关事件"""
+    __slots__ = ()
     
     def __init__(self, source: str, payload: AgentRequestPayload, msg_id: str,
                  session_id: Optional[str] = None, session_action: SessionAction = SessionAction.NEW):
-        super().__init__(
-            type=EventType.AGENT_DISPATCH_REQUEST,
-            source=source,
-            timestamp=time.time(),
-            payload=payload,
-            msg_id=msg_id,
-            session_id=session_id,
-            session_action=session_action
-        )
+        # 直接赋值槽位，不经过 dataclass 生成的 __init__
+        self.type = EventType.AGENT_DISPATCH_REQUEST
+        self.source = sys.intern(source)
+        self.timestamp_ns = _monotonic_ns()
+        self.payload = payload
+        self.msg_id = msg_id
+        self.session_id = session_id
+        self.session_action = session_action
 
 
 class AgentResponseEvent(ConversationEvent):
     """Agent响应事件 - 对话相关事件"""
+    __slots__ = ()
     
     def __init__(self, source: str, payload: AgentResponsePayload, msg_id: str):
-        super().__init__(
-            type=EventType.AGENT_RESPONSE,
-            source=source,
-            timestamp=time.time(),
-            payload=payload,
-            msg_id=msg_id
-        )
+        # 直接赋值槽位，不经过 dataclass 生成的 __init__
+        self.type = EventType.AGENT_RESPONSE
+        self.source = sys.intern(source)
+        self.timestamp_ns = _monotonic_ns()
+        self.payload = payload
+        self.msg_id = msg_id
+        self.session_id = None
+        self.session_action = None
 
 
 # 向后兼容：AgentResponse 作为 AgentResponsePayload 的别名
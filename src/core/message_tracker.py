@@ -3,31 +3,90 @@
 
 为每一轮对话创建唯一的 msgId，并追踪整个流水线中的输入输出
 """
-import uuid
+import atexit
+import math
+import secrets
 import time
 import json
+import logging
+import queue
+import threading
 import numpy as np
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Any, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import islice
 from threading import Lock
-from datetime import datetime
 from pathlib import Path
 
+# orjson 为可选依赖（序列化更快），模块加载时探测一次；不可用时回退到标准库 json
+try:
+    import orjson
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None
+
+
+logger = logging.getLogger("core.message_tracker")
+
 
 def _convert_to_json_serializable(obj):
-    """将对象转换为 JSON 可序列化的类型"""
+    """
+    将对象转换为 JSON 可序列化的类型
+    
+    只在容器内确实有需要转换的元素时才复制该容器，否则原样返回（不深拷贝嵌套数据）
+    """
     if isinstance(obj, (np.integer, np.floating)):
         return float(obj)
     elif isinstance(obj, np.ndarray):
         return obj.tolist()
     elif isinstance(obj, dict):
-        return {k: _convert_to_json_serializable(v) for k, v in obj.items()}
+        converted = None
+        for k, v in obj.items():
+            new_v = _convert_to_json_serializable(v)
+            if new_v is not v:
+                if converted is None:
+                    converted = dict(obj)
+                converted[k] = new_v
+        return obj if converted is None else converted
     elif isinstance(obj, (list, tuple)):
-        return [_convert_to_json_serializable(item) for item in obj]
+        items = [_convert_to_json_serializable(item) for item in obj]
+        if isinstance(obj, list) and all(new is old for new, old in zip(items, obj)):
+            return obj
+        return items
     return obj
 
 
-@dataclass
+@lru_cache(maxsize=4096)
+def _format_timestamp_ms(ts_ms: int) -> str:
+    """
+    将毫秒时间戳格式化为本地时间 'YYYY-MM-DD HH:MM:SS.mmm'
+    
+    直接拼接 time.localtime() 的字段，不经过 strftime；同一毫秒只格式化一次
+    """
+    seconds, millis = divmod(ts_ms, 1000)
+    t = time.localtime(seconds)
+    return (f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d} "
+            f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}.{millis:03d}")
+
+
+def _format_timestamp(ts: float) -> str:
+    """将 time.time() 时间戳格式化为 'YYYY-MM-DD HH:MM:SS.mmm'（与 datetime 一样先舍入到微秒再截断到毫秒）"""
+    frac, whole = math.modf(ts)
+    return _format_timestamp_ms(int(whole) * 1000 + round(frac * 1e6) // 1000)
+
+
+def _json_default(obj):
+    """json 编码回调：在编码时转换 numpy 类型（规则与 _convert_to_json_serializable 一致）"""
+    if isinstance(obj, (np.integer, np.floating)):
+        return float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+@dataclass(slots=True)
 class ModuleTrace:
     """模块追踪记录"""
     module_name: str                    # 模块名称
@@ -37,14 +96,32 @@ class ModuleTrace:
     output_data: Optional[Dict[str, Any]] = None  # 输出数据
     metadata: Dict[str, Any] = field(default_factory=dict)  # 元数据
     
+    def _as_dict(self) -> Dict[str, Any]:
+        """
+        浅层转换为字典（不复制嵌套数据，不转换 numpy 类型）
+        
+        为空的 input_data / output_data / metadata 不输出对应的键，读取时按缺省处理
+        """
+        d = {
+            'module_name': self.module_name,
+            'timestamp': self.timestamp,
+            'event_type': self.event_type,
+        }
+        if self.input_data is not None:
+            d['input_data'] = self.input_data
+        if self.output_data is not None:
+            d['output_data'] = self.output_data
+        if self.metadata:
+            d['metadata'] = self.metadata
+        return d
+    
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        result = asdict(self)
-        # 转换 numpy 类型为 Python 原生类型
-        return _convert_to_json_serializable(result)
+        # 转换 numpy 类型为 Python 原生类型（转换过程本身会生成新的容器）
+        return _convert_to_json_serializable(self._as_dict())
 
 
-@dataclass
+@dataclass(slots=True)
 class MessageTrace:
     """消息完整追踪记录"""
     msg_id: str                         # 消息ID
@@ -55,6 +132,8 @@ class MessageTrace:
     end_time: Optional[float] = None    # 结束时间
     traces: List[ModuleTrace] = field(default_factory=list)  # 各模块的追踪记录
     metadata: Dict[str, Any] = field(default_factory=dict)   # 元数据
+    # 已完成记录的浅层字典缓存：(缓存键, 字典)，缓存键见 _cache_key()
+    _dict_cache: Optional[Tuple[tuple, Dict[str, Any]]] = field(default=None, init=False, repr=False, compare=False)
     
     @property
     def duration_ms(self) -> float:
@@ -78,24 +157,60 @@ class MessageTrace:
         )
         self.traces.append(trace)
     
-    def to_dict(self) -> Dict[str, Any]:
-        """转换为字典"""
+    def _cache_key(self) -> tuple:
+        """
+        字典缓存的有效性键：记录的可变字段（步骤数、查询、响应、结束时间）任一变化即失效
+        
+        在构建字典之前取键，构建期间其他线程的修改只会让缓存提前失效，不会返回过期内容
+        """
+        return (len(self.traces), self.query, self.response, self.end_time)
+    
+    def _as_dict(self) -> Dict[str, Any]:
+        """
+        浅层转换为字典（不复制嵌套数据，不转换 numpy 类型）
+        
+        已完成的记录在内容不变时复用上次的结果（调用方不应修改返回的字典）
+        """
+        key = self._cache_key()
+        cache = self._dict_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        
         result = {
             'msg_id': self.msg_id,
             'session_type': self.session_type,
             'start_time': self.start_time,
-            'start_time_str': datetime.fromtimestamp(self.start_time).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3],
+            'start_time_str': _format_timestamp(self.start_time),
             'query': self.query,
             'response': self.response,
             'end_time': self.end_time,
             'duration_ms': self.duration_ms,
-            'traces': [trace.to_dict() for trace in self.traces],
+            'traces': [trace._as_dict() for trace in self.traces],
             'metadata': self.metadata
         }
         if self.end_time:
-            result['end_time_str'] = datetime.fromtimestamp(self.end_time).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
-        # 转换 numpy 类型为 Python 原生类型
-        return _convert_to_json_serializable(result)
+            result['end_time_str'] = _format_timestamp(self.end_time)
+            self._dict_cache = (key, result)
+        return result
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        # 转换 numpy 类型为 Python 原生类型；顶层复制一份，避免调用方改动缓存
+        return dict(_convert_to_json_serializable(self._as_dict()))
+    
+    def to_json(self) -> str:
+        """直接编码为紧凑的 JSON 字符串（numpy 类型在编码时转换，不构建中间字典副本）"""
+        if orjson is not None:
+            return orjson.dumps(self._as_dict(), default=_json_default, option=_ORJSON_OPTIONS).decode()
+        return json.dumps(self._as_dict(), ensure_ascii=False, separators=(',', ':'),
+                          default=_json_default)
+    
+    def _to_json_line(self) -> bytes:
+        """编码为一行 UTF-8 JSONL（orjson 直接产出 bytes，不经过 str 往返）"""
+        if orjson is not None:
+            return orjson.dumps(self._as_dict(), default=_json_default,
+                                option=_ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+        return (self.to_json() + '\n').encode('utf-8')
 
 
 class MessageTracker:
@@ -109,6 +224,11 @@ class MessageTracker:
     4. 支持持久化存储
     """
     
+    # 后台写线程每批最多写入的记录数（每批只 flush 一次）
+    WRITE_BATCH_SIZE = 64
+    # 内存中最多保留的追踪记录数，超出时淘汰最早的记录（已完成的记录仍保存在日志文件中）
+    MAX_TRACES = 10000
+    
     def __init__(self, log_dir: Optional[str] = None, enable_file_logging: bool = True):
         """
         初始化消息追踪器
@@ -117,8 +237,13 @@ class MessageTracker:
             log_dir: 日志目录路径
             enable_file_logging: 是否启用文件日志
         """
-        self._traces: Dict[str, MessageTrace] = {}
+        # 按创建顺序排列，便于从头部淘汰最早的记录
+        self._traces: OrderedDict[str, MessageTrace] = OrderedDict()
+        # 只保护增删记录和遍历 _traces 的多步操作；
+        # 单条记录的查询和更新依赖 GIL 下单次字典/属性操作的原子性，不加锁
         self._lock = Lock()
+        # 等待追踪完成的事件（只为有调用方等待的消息创建），由 complete_trace 触发
+        self._completion_events: Dict[str, threading.Event] = {}
         self._enable_file_logging = enable_file_logging
         
         # 配置日志目录
@@ -127,9 +252,24 @@ class MessageTracker:
         else:
             self._log_dir = Path(__file__).parent.parent.parent / "logs" / "message_traces"
         
+        # 当前日志文件句柄（按日期轮换，首次写入时打开；由后台写线程访问，写线程关闭后由 _write_sync 访问）
+        self._log_fh = None
+        self._log_date: Optional[str] = None
+        
+        # 已完成的追踪记录由后台线程写入文件，调用方不必等待磁盘 I/O（None 表示停止）
+        self._write_queue: queue.Queue = queue.Queue()
+        self._writer_thread: Optional[threading.Thread] = None
+        # 写线程关闭后，同步写入由此锁串行化
+        self._sync_write_lock = Lock()
+        
         if self._enable_file_logging:
             self._log_dir.mkdir(parents=True, exist_ok=True)
-            print(f"📝 消息追踪日志目录: {self._log_dir}")
+            logger.info("📝 消息追踪日志目录: %s", self._log_dir)
+            self._writer_thread = threading.Thread(
+                target=self._writer_loop, name="MessageTraceWriter", daemon=True
+            )
+            self._writer_thread.start()
+            atexit.register(self.close)
     
     def create_message_id(self, session_type: str = "wakeword", **metadata) -> str:
         """
@@ -143,7 +283,7 @@ class MessageTracker:
             生成的消息ID
         """
         # 生成唯一ID
-        msg_id = f"msg_{int(time.time()*1000)}_{uuid.uuid4().hex[:8]}"
+        msg_id = f"msg_{time.time_ns() // 1_000_000}_{secrets.token_hex(4)}"
         
         # 创建追踪记录
         trace = MessageTrace(
@@ -154,9 +294,12 @@ class MessageTracker:
         )
         
         with self._lock:
-            self._traces[msg_id] = trace
+            traces = self._traces
+            traces[msg_id] = trace
+            if len(traces) > self.MAX_TRACES:
+                traces.popitem(last=False)
         
-        print(f"🆔 创建新消息ID: {msg_id} (类型: {session_type})")
+        logger.info("🆔 创建新消息ID: %s (类型: %s)", msg_id, session_type)
         return msg_id
     
     def add_trace(self, msg_id: str, module_name: str, event_type: str,
@@ -174,29 +317,30 @@ class MessageTracker:
             output_data: 输出数据
             **metadata: 元数据
         """
-        with self._lock:
-            if msg_id not in self._traces:
-                print(f"⚠️  未找到消息ID: {msg_id}")
-                return
-            
-            trace = self._traces[msg_id]
-            trace.add_trace(module_name, event_type, input_data, output_data, **metadata)
-            
-            # 简化的日志输出
+        # 单次字典查找和 list.append 在 GIL 下都是原子操作，无需加锁
+        trace = self._traces.get(msg_id)
+        if trace is None:
+            logger.warning("⚠️  未找到消息ID: %s", msg_id)
+            return
+        
+        trace.add_trace(module_name, event_type, input_data, output_data, **metadata)
+        
+        # 简化的日志输出（每个流水线步骤一条，只在 DEBUG 级别输出）
+        if logger.isEnabledFor(logging.DEBUG):
             direction = "→" if input_data else "←" if output_data else "·"
-            print(f"   {direction} [{module_name}] {event_type}")
+            logger.debug("   %s [%s] %s", direction, module_name, event_type)
     
     def update_query(self, msg_id: str, query: str):
         """更新查询内容"""
-        with self._lock:
-            if msg_id in self._traces:
-                self._traces[msg_id].query = query
+        trace = self._traces.get(msg_id)
+        if trace is not None:
+            trace.query = query
     
     def update_response(self, msg_id: str, response: str):
         """更新响应内容"""
-        with self._lock:
-            if msg_id in self._traces:
-                self._traces[msg_id].response = response
+        trace = self._traces.get(msg_id)
+        if trace is not None:
+            trace.response = response
     
     def complete_trace(self, msg_id: str):
         """
@@ -206,26 +350,61 @@ class MessageTracker:
             msg_id: 消息ID
         """
         with self._lock:
-            if msg_id not in self._traces:
-                print(f"⚠️  未找到消息ID: {msg_id}")
+            trace = self._traces.get(msg_id)
+            if trace is None:
+                logger.warning("⚠️  未找到消息ID: %s", msg_id)
                 return
             
-            trace = self._traces[msg_id]
             trace.end_time = time.time()
+            completion_event = self._completion_events.pop(msg_id, None)
+        
+        # 唤醒等待该消息完成的调用方
+        if completion_event is not None:
+            completion_event.set()
+        
+        # 输出摘要（在锁外格式化，日志级别关闭时不做格式化）
+        if logger.isEnabledFor(logging.INFO):
+            response = trace.response
+            logger.info(
+                "\n%s\n✅ 消息追踪完成: %s\n   类型: %s\n   查询: %s\n   响应: %s\n"
+                "   总耗时: %.2fms\n   模块数: %d\n%s\n",
+                '=' * 80, msg_id, trace.session_type, trace.query,
+                f"{response[:100]}..." if len(response) > 100 else response,
+                trace.duration_ms, len(trace.traces), '=' * 80
+            )
+        
+        # 交给后台线程写入文件（不在锁内做磁盘 I/O）；写线程已关闭时同步写入
+        if self._enable_file_logging:
+            if self._writer_thread is not None:
+                self._write_queue.put(trace)
+            else:
+                self._write_sync([trace])
+    
+    def wait_for_completion(self, msg_id: str, timeout: Optional[float] = None) -> bool:
+        """
+        阻塞等待追踪完成（complete_trace 被调用）
+        
+        Args:
+            msg_id: 消息ID
+            timeout: 最长等待时间（秒），None 表示一直等待
             
-            # 打印摘要
-            print(f"\n{'='*80}")
-            print(f"✅ 消息追踪完成: {msg_id}")
-            print(f"   类型: {trace.session_type}")
-            print(f"   查询: {trace.query}")
-            print(f"   响应: {trace.response[:100]}..." if len(trace.response) > 100 else f"   响应: {trace.response}")
-            print(f"   总耗时: {trace.duration_ms:.2f}ms")
-            print(f"   模块数: {len(trace.traces)}")
-            print(f"{'='*80}\n")
-            
-            # 写入文件
-            if self._enable_file_logging:
-                self._write_to_file(trace)
+        Returns:
+            是否在超时前完成
+        """
+        with self._lock:
+            trace = self._traces.get(msg_id)
+            if trace is None:
+                return False
+            if trace.end_time is not None:
+                return True
+            event = self._completion_events.setdefault(msg_id, threading.Event())
+        
+        try:
+            return event.wait(timeout)
+        finally:
+            with self._lock:
+                if self._completion_events.get(msg_id) is event:
+                    del self._completion_events[msg_id]
     
     def get_trace(self, msg_id: str) -> Optional[MessageTrace]:
         """
@@ -237,8 +416,7 @@ class MessageTracker:
         Returns:
             追踪记录，如果不存在则返回None
         """
-        with self._lock:
-            return self._traces.get(msg_id)
+        return self._traces.get(msg_id)
     
     def get_recent_traces(self, count: int = 10) -> List[MessageTrace]:
         """
@@ -248,37 +426,107 @@ class MessageTracker:
             count: 返回数量
             
         Returns:
-            追踪记录列表
+            追踪记录列表（按开始时间从新到旧）
         """
+        # 记录按创建顺序插入字典，开始时间也在创建时取，逆序取前 count 条即可，无需排序
         with self._lock:
-            traces = sorted(
-                self._traces.values(),
-                key=lambda t: t.start_time,
-                reverse=True
-            )
-            return traces[:count]
+            return list(islice(reversed(self._traces.values()), count))
+    
+    def _writer_loop(self):
+        """后台写线程：批量取出已完成的追踪记录写入文件，每批只 flush 一次"""
+        write_queue = self._write_queue
+        running = True
+        while running:
+            batch = [write_queue.get()]
+            while len(batch) < self.WRITE_BATCH_SIZE:
+                try:
+                    batch.append(write_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            for trace in batch:
+                if trace is None:
+                    running = False
+                    break
+                self._write_to_file(trace)
+            
+            if self._log_fh is not None:
+                try:
+                    # 每批写完即 flush（不 fsync），便于实时查看日志
+                    self._log_fh.flush()
+                except Exception as e:
+                    logger.error("❌ 写入追踪日志失败: %s", e)
+        
+        self._close_log_file()
     
     def _write_to_file(self, trace: MessageTrace):
-        """将追踪记录写入文件"""
+        """将追踪记录写入文件（由后台写线程调用，写线程关闭后经 _write_sync 调用）"""
         try:
-            # 按日期组织文件
-            date_str = datetime.fromtimestamp(trace.start_time).strftime('%Y-%m-%d')
-            log_file = self._log_dir / f"traces_{date_str}.jsonl"
+            line = trace._to_json_line()
+            
+            # 按日期组织文件，日期变化时切换到新文件
+            date_str = _format_timestamp(trace.start_time)[:10]
+            if date_str != self._log_date:
+                self._close_log_file()
+                log_file = self._log_dir / f"traces_{date_str}.jsonl"
+                self._log_fh = open(log_file, 'ab', buffering=65536)
+                self._log_date = date_str
             
             # 追加写入（JSONL格式）
-            with open(log_file, 'a', encoding='utf-8') as f:
-                json.dump(trace.to_dict(), f, ensure_ascii=False)
-                f.write('\n')
+            self._log_fh.write(line)
                 
         except Exception as e:
-            print(f"❌ 写入追踪日志失败: {e}")
+            logger.error("❌ 写入追踪日志失败: %s", e)
     
-    def print_trace_summary(self, msg_id: str):
+    def _close_log_file(self):
+        """关闭当前日志文件"""
+        if self._log_fh is not None:
+            try:
+                self._log_fh.close()
+            finally:
+                self._log_fh = None
+                self._log_date = None
+    
+    def close(self):
+        """
+        写完队列中剩余的追踪记录并关闭日志文件（进程退出时自动调用）
+
+        关闭后不再有写线程消费队列，之后完成的追踪记录直接同步写入文件
+        """
+        writer_thread = self._writer_thread
+        if writer_thread is None:
+            return
+        self._writer_thread = None
+        atexit.unregister(self.close)
+        self._write_queue.put(None)
+        writer_thread.join(timeout=5.0)
+        
+        # 与关闭并发完成、排在停止标记之后的记录由当前线程补写
+        pending = []
+        while True:
+            try:
+                trace = self._write_queue.get_nowait()
+            except queue.Empty:
+                break
+            if trace is not None:
+                pending.append(trace)
+        if pending:
+            self._write_sync(pending)
+    
+    def _write_sync(self, traces: List[MessageTrace]):
+        """写线程关闭后在调用方线程中写入追踪记录，写完即关闭文件"""
+        with self._sync_write_lock:
+            for trace in traces:
+                self._write_to_file(trace)
+            self._close_log_file()
+    
+    def print_trace_summary(self, msg_id: str, verbose: bool = True):
         """
         打印追踪记录摘要
         
         Args:
             msg_id: 消息ID
+            verbose: 是否打印每一步的输入/输出/元数据（为 False 时只打印步骤列表，不做 JSON 格式化）
         """
         trace = self.get_trace(msg_id)
         if not trace:
@@ -289,9 +537,9 @@ class MessageTracker:
         print(f"消息追踪报告: {msg_id}")
         print(f"{'='*80}")
         print(f"会话类型: {trace.session_type}")
-        print(f"开始时间: {datetime.fromtimestamp(trace.start_time).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
+        print(f"开始时间: {_format_timestamp(trace.start_time)}")
         if trace.end_time:
-            print(f"结束时间: {datetime.fromtimestamp(trace.end_time).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]}")
+            print(f"结束时间: {_format_timestamp(trace.end_time)}")
         print(f"总耗时: {trace.duration_ms:.2f}ms")
         print(f"用户查询: {trace.query}")
         print(f"系统响应: {trace.response}")
@@ -299,9 +547,12 @@ class MessageTracker:
         print(f"{'-'*80}")
         
         for i, module_trace in enumerate(trace.traces, 1):
-            time_str = datetime.fromtimestamp(module_trace.timestamp).strftime('%H:%M:%S.%f')[:-3]
+            time_str = _format_timestamp(module_trace.timestamp)[11:]
             print(f"\n{i}. [{time_str}] {module_trace.module_name} - {module_trace.event_type}")
             
+            if not verbose:
+                continue
+            
             if module_trace.input_data:
                 print(f"   输入: {json.dumps(module_trace.input_data, ensure_ascii=False, indent=6)}")
             
@@ -323,16 +574,18 @@ class MessageTracker:
         cutoff_time = time.time() - (max_age_hours * 3600)
         
         with self._lock:
-            old_ids = [
-                msg_id for msg_id, trace in self._traces.items()
-                if trace.start_time < cutoff_time
-            ]
+            # 字典按创建（开始时间）顺序排列，过期记录都在最前面，遇到第一条未过期的即可停止
+            old_ids = []
+            for msg_id, trace in self._traces.items():
+                if trace.start_time >= cutoff_time:
+                    break
+                old_ids.append(msg_id)
             
             for msg_id in old_ids:
                 del self._traces[msg_id]
             
             if old_ids:
-                print(f"🧹 清理了 {len(old_ids)} 条旧的追踪记录")
+                logger.info("🧹 清理了 %d 条旧的追踪记录", len(old_ids))
 
 
 # 全局单例
@@ -5,19 +5,26 @@
 """
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+import logging
+import time
 import uuid
 
 
-@dataclass
+logger = logging.getLogger("core.session_manager")
+
+# 已结束的会话状态，出现在栈顶时会被弹出
+_FINISHED_STATES = frozenset(('completed', 'error'))
+
+
+@dataclass(slots=True)
 class AgentSession:
     """Agent会话状态"""
     session_id: str                          # 会话ID
     agent_name: str                          # Agent名称
     state: str                               # 状态: running, waiting_input, paused, completed, error
     context: Dict[str, Any] = field(default_factory=dict)  # 上下文数据
-    created_at: float = field(default_factory=lambda: datetime.now().timestamp())
-    updated_at: float = field(default_factory=lambda: datetime.now().timestamp())
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
     
     # 等待用户输入的提示
     pending_prompt: Optional[str] = None
@@ -30,12 +37,23 @@ class AgentSession:
     # 是否允许被打断
     interruptible: bool = True
     
+    def set_state(self, state: str):
+        """设置会话状态（状态切换的快速路径，直接赋值）"""
+        self.state = state
+        self.updated_at = time.time()
+    
+    def set_prompt(self, prompt: Optional[str], expected_type: Optional[str] = None):
+        """设置等待用户输入的提示（prompt 为 None 表示清除）"""
+        self.pending_prompt = prompt
+        self.expected_input_type = expected_type
+        self.updated_at = time.time()
+    
     def update(self, **kwargs):
-        """更新会话"""
+        """更新会话（通用接口，按名称设置任意字段）"""
         for key, value in kwargs.items():
             if hasattr(self, key):
                 setattr(self, key, value)
-        self.updated_at = datetime.now().timestamp()
+        self.updated_at = time.time()
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -60,6 +78,8 @@ class SessionManager:
         self._sessions: Dict[str, AgentSession] = {}
         # 用户的会话栈（支持多个会话嵌套）
         self._user_session_stack: Dict[str, List[str]] = {}  # user_id -> [session_id]
+        # 栈顶活跃会话缓存（user_id -> session），命中时只需校验栈顶与状态
+        self._active_session_by_user: Dict[str, AgentSession] = {}
     
     def create_session(self, agent_name: str, user_id: str = "default", 
                       priority: int = 2) -> AgentSession:
@@ -87,25 +107,25 @@ class SessionManager:
         # 检查当前活跃会话
         current_session = self.get_active_session(user_id)
         if current_session:
-            print(f"[SessionManager] 尝试创建会话 [{agent_name}] (优先级{priority})")
-            print(f"[SessionManager] {current_session.session_id}, {current_session.state}")
+            logger.debug("[SessionManager] 尝试创建会话 [%s] (优先级%d)", agent_name, priority)
+            logger.debug("[SessionManager] %s, %s", current_session.session_id, current_session.state)
             # 有活跃会话，检查优先级
             if priority > current_session.priority:
                 # 新会话优先级更高
                 if current_session.priority < 3:
                     # 当前会话优先级<3，可被打断
-                    print(f"⏸️  暂停会话 [{current_session.agent_name}] (优先级{current_session.priority}) "
-                          f"以启动更高优先级会话 [{agent_name}] (优先级{priority})")
-                    current_session.update(state="paused")
+                    logger.info("⏸️  暂停会话 [%s] (优先级%d) 以启动更高优先级会话 [%s] (优先级%d)",
+                                current_session.agent_name, current_session.priority, agent_name, priority)
+                    current_session.set_state("paused")
                 else:
                     # 当前会话优先级=3，不可打断
-                    print(f"🚫 会话 [{current_session.agent_name}] (优先级{current_session.priority}) 不可被打断，"
-                          f"拒绝创建新会话 [{agent_name}]")
+                    logger.info("🚫 会话 [%s] (优先级%d) 不可被打断，拒绝创建新会话 [%s]",
+                                current_session.agent_name, current_session.priority, agent_name)
                     return None
             else:
                 # 新会话优先级不够高，拒绝创建
-                print(f"🚫 当前会话 [{current_session.agent_name}] 优先级({current_session.priority}) "
-                      f">= 新会话 [{agent_name}] 优先级({priority})，拒绝创建")
+                logger.info("🚫 当前会话 [%s] 优先级(%d) >= 新会话 [%s] 优先级(%d)，拒绝创建",
+                            current_session.agent_name, current_session.priority, agent_name, priority)
                 return None
         
         # 判断是否可被打断（只有优先级3不可被打断）
@@ -125,10 +145,12 @@ class SessionManager:
         # 将会话压入栈
         if user_id not in self._user_session_stack:
             self._user_session_stack[user_id] = []
+        self._active_session_by_user.pop(user_id, None)
         self._user_session_stack[user_id].append(session_id)
+        self._active_session_by_user[user_id] = session
         
-        can_interrupt_str = "不可打断" if priority == 3 else "可打断"
-        print(f"✅ 创建会话 [{agent_name}] (优先级{priority}, {can_interrupt_str})")
+        logger.info("✅ 创建会话 [%s] (优先级%d, %s)",
+                    agent_name, priority, "不可打断" if priority == 3 else "可打断")
         
         return session
     
@@ -142,29 +164,38 @@ class SessionManager:
         Returns:
             活跃会话，如果没有则返回None
         """
-        stack = self._user_session_stack.get(user_id, [])
+        stack = self._user_session_stack.get(user_id)
+        if not stack:
+            return None
 
-        # 打印整个stack的内容
-        if stack:
+        # 快速路径：缓存仍是栈顶且未结束
+        cached = self._active_session_by_user.get(user_id)
+        if (cached is not None and stack[-1] == cached.session_id
+                and cached.state not in _FINISHED_STATES):
+            return cached
+
+        if __debug__ and logger.isEnabledFor(logging.DEBUG):
             for pos, session_id in enumerate(stack):
-                # 根据ID获取会话对象
                 session = self._sessions.get(session_id)
-                # 打印位置（栈底→栈顶）+ 会话信息
-                print(f" 123 栈位置{pos}: {session if session else f'会话{session_id}不存在'}", {session.agent_name if session else 'N/A'}, session_id)
-                
+                logger.debug("栈位置%d: %s (%s)", pos,
+                             session.agent_name if session else f"会话{session_id}不存在",
+                             session_id)
+
         # 从栈顶开始查找第一个活跃的会话
         while stack:
             session_id = stack[-1]
             session = self._sessions.get(session_id)
             
             # 如果会话不存在或已完成/错误，从栈中移除
-            if not session or session.state in ['completed', 'error']:
+            if not session or session.state in _FINISHED_STATES:
                 stack.pop()
                 continue
             
             # 返回活跃的会话（running, waiting_input, paused）
+            self._active_session_by_user[user_id] = session
             return session
         
+        self._active_session_by_user.pop(user_id, None)
         return None
     
     def pause_current_session(self, user_id: str = "default") -> Optional[AgentSession]:
@@ -179,7 +210,7 @@ class SessionManager:
         """
         session = self.get_active_session(user_id)
         if session and session.interruptible:
-            session.update(state="paused")
+            session.set_state("paused")
             return session
         return None
     
@@ -195,7 +226,7 @@ class SessionManager:
         """
         session = self.get_active_session(user_id)
         if session and session.state == "paused":
-            session.update(state="running")
+            session.set_state("running")
         return session
     
     def pop_session(self, user_id: str = "default") -> Optional[AgentSession]:
@@ -211,9 +242,10 @@ class SessionManager:
         stack = self._user_session_stack.get(user_id, [])
         if stack:
             session_id = stack.pop()
+            self._active_session_by_user.pop(user_id, None)
             session = self._sessions.get(session_id)
             if session:
-                session.update(state="completed")
+                session.set_state("completed")
             return session
         return None
     
@@ -240,11 +272,9 @@ class SessionManager:
             expected_type: 期望的输入类型
         """
         if session_id in self._sessions:
-            self._sessions[session_id].update(
-                state="waiting_input",
-                pending_prompt=prompt,
-                expected_input_type=expected_type
-            )
+            session = self._sessions[session_id]
+            session.state = "waiting_input"
+            session.set_prompt(prompt, expected_type)
     
     def resume_session(self, session_id: str, user_input: str):
         """
@@ -259,10 +289,9 @@ class SessionManager:
         """
         if session_id in self._sessions:
             session = self._sessions[session_id]
-            session.update(
-                state="running",
-                pending_prompt=None
-            )
+            session.state = "running"
+            session.pending_prompt = None
+            session.updated_at = time.time()
             # 将用户输入添加到上下文
             session.context['last_user_input'] = user_input
             return session
@@ -278,25 +307,26 @@ class SessionManager:
         """
         if session_id in self._sessions:
             session = self._sessions[session_id]
-            session.update(state="completed")
+            session.set_state("completed")
             
             # 从栈中移除
             stack = self._user_session_stack.get(user_id, [])
             if session_id in stack:
                 stack.remove(session_id)
-                print(f"✅ 完成会话 [{session.agent_name}] (session_id: {session_id[:8]}...)")
-                print(f"   栈中剩余会话: {len(stack)} 个")
+                self._active_session_by_user.pop(user_id, None)
+                logger.info("✅ 完成会话 [%s] (session_id: %.8s...)", session.agent_name, session_id)
+                logger.info("   栈中剩余会话: %d 个", len(stack))
             else:
-                print(f"⚠️  会话 {session_id[:8]} 不在栈中 (可能已被移除)")
+                logger.warning("⚠️  会话 %.8s 不在栈中 (可能已被移除)", session_id)
             
             # 如果栈中还有暂停的会话，自动恢复栈顶会话
             if stack:
                 top_session = self._sessions.get(stack[-1])
                 if top_session and top_session.state == "paused":
-                    top_session.update(state="running")
-                    print(f"🔄 自动恢复会话 [{top_session.agent_name}] (session_id: {top_session.session_id[:8]}...)")
+                    top_session.set_state("running")
+                    logger.info("🔄 自动恢复会话 [%s] (session_id: %.8s...)", top_session.agent_name, top_session.session_id)
             else:
-                print(f"   当前栈为空，没有需要恢复的会话")
+                logger.info("   当前栈为空，没有需要恢复的会话")
     
     def get_session(self, session_id: str) -> Optional[AgentSession]:
         """
@@ -322,6 +352,7 @@ class SessionManager:
             if session_id in self._sessions:
                 del self._sessions[session_id]
         self._user_session_stack[user_id] = []
+        self._active_session_by_user.pop(user_id, None)
     
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -363,7 +394,7 @@ class SessionManager:
         session = self._sessions.get(session_id)
         if session:
             session.context.update(data)
-            session.updated_at = datetime.now().timestamp()
+            session.updated_at = time.time()
 
 
 # 全局实例
@@ -3,29 +3,59 @@
 
 集中定义系统中使用的各种数据类型
 """
+import sys
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Any, Optional, Protocol, Dict, List
+from types import MappingProxyType
+from typing import Any, Optional, Protocol, Dict, List, Mapping, NamedTuple, Sequence, Tuple
+
+
+# 共享的只读空映射：作为只读元数据字段的默认值，未使用元数据时不必为每个实例分配字典；
+# 需要写入元数据的生产方应显式传入新的 dict
+EMPTY_MAPPING: Mapping[str, Any] = MappingProxyType({})
 
 
 # ============================================================================
 # 记忆相关类型
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class ShortTermMemory:
     """短期记忆（对话历史）"""
     query: str                          # 用户查询
     response: str                       # 系统响应
     timestamp: float                    # 时间戳
     agent: str = ""                     # 处理该记忆的Agent名称
-    tools_used: List[str] = field(default_factory=list)  # 使用的工具列表
+    tools_used: Sequence[str] = ()      # 使用的工具列表（未使用工具时为共享的空元组）
     description: str = ""               # 文本化描述
     success: bool = True                # 记忆是否成功
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(default_factory=lambda: EMPTY_MAPPING)
+    
+    def add_tool(self, name: str):
+        """记录使用的工具（首次添加时才分配列表）"""
+        if not isinstance(self.tools_used, list):
+            self.tools_used = list(self.tools_used)
+        self.tools_used.append(sys.intern(name))
 
 
-@dataclass
+class ShortTermMemoryRecord(NamedTuple):
+    """
+    短期记忆检索结果（只读）
+    
+    字段与 ShortTermMemory 相同；检索结果只读不写，使用元组构造开销更小。
+    写入记忆时仍使用 ShortTermMemory
+    """
+    query: str
+    response: str
+    timestamp: float
+    agent: str = ""
+    tools_used: Tuple[str, ...] = ()
+    description: str = ""
+    success: bool = True
+    metadata: Mapping[str, Any] = EMPTY_MAPPING
+
+
+@dataclass(slots=True)
 class LongTermMemory:
     """长期记忆（用户画像和总结）"""
     summary: str                       # 对话摘要
@@ -44,7 +74,7 @@ class QueryType(Enum):
     SYSTEM_EVENT = "system_event"      # 系统事件
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemState:
     """系统状态"""
     state_type: str                    # 状态类型（vehicle/music/navigation等）
@@ -56,7 +86,7 @@ class SystemState:
 # Agent 相关类型
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class AgentInfo:
     """Agent信息"""
     name: str                          # Agent名称
@@ -64,10 +94,10 @@ class AgentInfo:
     capabilities: List[str]            # Agent能力列表
     priority: int                       # 优先级
     enabled: bool = True               # 是否启用
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(default_factory=lambda: EMPTY_MAPPING)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentContext:
     """Agent上下文"""
     recent_memories: List[ShortTermMemory]  # 最近的短期记忆（按时间顺序）
@@ -78,18 +108,14 @@ class AgentContext:
     
     @property
     def short_term_memories(self) -> List[ShortTermMemory]:
-        """向后兼容：返回所有短期记忆（最近+相关，去重）"""
-        seen = set()
-        merged = []
+        """向后兼容：返回所有短期记忆（最近+相关，按时间戳去重）"""
+        # 单次遍历去重并保持顺序：同一时间戳保留最先出现的记忆
+        by_timestamp = {}
         for mem in self.recent_memories:
-            if mem.timestamp not in seen:
-                merged.append(mem)
-                seen.add(mem.timestamp)
+            by_timestamp.setdefault(mem.timestamp, mem)
         for mem in self.related_memories:
-            if mem.timestamp not in seen:
-                merged.append(mem)
-                seen.add(mem.timestamp)
-        return merged
+            by_timestamp.setdefault(mem.timestamp, mem)
+        return list(by_timestamp.values())
 
 
 @dataclass
@@ -111,16 +137,16 @@ class IAgent(Protocol):
 # Orchestrator 相关类型
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class OrchestratorInput:
     """Orchestrator输入"""
     query_type: QueryType              # 查询类型
     query_content: str                 # 查询内容
     timestamp: float                   # 时间戳
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Mapping[str, Any] = field(default_factory=lambda: EMPTY_MAPPING)
 
 
-@dataclass
+@dataclass(slots=True)
 class OrchestratorContext:
     """Orchestrator上下文"""
     input_query: OrchestratorInput     # 输入查询
@@ -130,7 +156,7 @@ class OrchestratorContext:
     available_agents: List[AgentInfo]  # 可用的Agents
     
     
-@dataclass
+@dataclass(slots=True)
 class OrchestratorDecision:
     """Orchestrator决策结果"""
     selected_agent: str                # 选中的Agent名称
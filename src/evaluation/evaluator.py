@@ -3,17 +3,54 @@
 
 用于评估系统的Agent选择和响应质量
 """
+import asyncio
+import hashlib
 import json
+import multiprocessing
+import sqlite3
+import threading
 import time
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Callable
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
 
+# orjson 为可选依赖（解析/编码更快），不可用时回退到标准库 json
+# orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，异常处理无需区分
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+# 规则评估：响应中表示出错的关键词（一次扫描，不区分大小写，无需复制小写字符串）
+_ERROR_RE = re.compile(r'错误|error|失败|failed', re.IGNORECASE)
+
+
+def _json_loads(data):
+    """解析JSON（优先使用 orjson）"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_line(obj) -> bytes:
+    """编码为一行 UTF-8 JSONL（优先使用 orjson）"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+# 评估结果目录
+_RESULTS_DIR = Path(__file__).parent.parent.parent / "logs" / "evaluation_results"
+
+
+@dataclass(slots=True)
 class TestCase:
     """测试用例"""
     query: str                          # 用户查询
@@ -32,8 +69,21 @@ class TestCase:
     msg_id: Optional[str] = None                # 消息追踪ID
     
     def to_dict(self) -> Dict:
-        """转换为字典"""
-        return asdict(self)
+        """转换为字典（字段均为不可变值，直接构建，不经过 asdict 的递归复制）"""
+        return {
+            'query': self.query,
+            'expected_agent': self.expected_agent,
+            'expected_response': self.expected_response,
+            'category': self.category,
+            'actual_agent': self.actual_agent,
+            'actual_response': self.actual_response,
+            'agent_match': self.agent_match,
+            'response_pass': self.response_pass,
+            'evaluation_reason': self.evaluation_reason,
+            'duration_ms': self.duration_ms,
+            'error': self.error,
+            'msg_id': self.msg_id
+        }
     
     @property
     def passed(self) -> bool:
@@ -45,7 +95,7 @@ class TestCase:
         return self.agent_match and self.response_pass
 
 
-@dataclass
+@dataclass(slots=True)
 class EvaluationResult:
     """评估结果"""
     total_cases: int                    # 总测试数
@@ -68,9 +118,14 @@ class EvaluationResult:
         """总耗时（秒）"""
         return self.end_time - self.start_time
     
-    def to_dict(self) -> Dict:
-        """转换为字典"""
-        return {
+    def to_dict(self, include_cases: bool = True) -> Dict:
+        """
+        转换为字典
+        
+        Args:
+            include_cases: 是否包含所有测试用例（为 False 时只输出统计摘要）
+        """
+        summary = {
             'total_cases': self.total_cases,
             'passed_cases': self.passed_cases,
             'failed_cases': self.failed_cases,
@@ -81,25 +136,118 @@ class EvaluationResult:
             'duration_seconds': self.duration_seconds,
             'start_time': datetime.fromtimestamp(self.start_time).strftime('%Y-%m-%d %H:%M:%S'),
             'end_time': datetime.fromtimestamp(self.end_time).strftime('%Y-%m-%d %H:%M:%S'),
-            'test_cases': [tc.to_dict() for tc in self.test_cases]
         }
+        if include_cases:
+            summary['test_cases'] = [tc.to_dict() for tc in self.test_cases]
+        return summary
+
+
+class _JudgeCache:
+    """
+    评估结果缓存（SQLite持久化）
+    
+    以评估请求内容的SHA256为键，相同的(查询, 预期响应, 实际响应)不重复调用评估模型
+    """
+    
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # 评估调用在工作线程中执行，连接跨线程共享，由锁串行化访问
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS judge_cache "
+                "(key TEXT PRIMARY KEY, pass INTEGER, reason TEXT, ts INTEGER)"
+            )
+            self._conn.commit()
+    
+    @staticmethod
+    def make_key(model: str, test_case: 'TestCase') -> str:
+        """根据模型和评估内容生成缓存键（固定使用标准库 json，保证键与是否安装 orjson 无关）"""
+        payload = json.dumps({
+            'model': model,
+            'query': test_case.query,
+            'expected': test_case.expected_response,
+            'actual': test_case.actual_response
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[tuple[bool, str]]:
+        """查询缓存，未命中返回None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT pass, reason FROM judge_cache WHERE key = ?", (key,)
+            ).fetchone()
+        return (bool(row[0]), row[1]) if row else None
+    
+    def put(self, key: str, passed: bool, reason: str):
+        """写入缓存"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO judge_cache (key, pass, reason, ts) VALUES (?, ?, ?, ?)",
+                (key, int(bool(passed)), str(reason), int(time.time()))
+            )
+            self._conn.commit()
+    
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
 
 
 class QwenEvaluator:
     """使用Qwen Plus模型进行评估"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    MODEL = "qwen-plus"
+    
+    def __init__(self, api_key: Optional[str] = None, enable_cache: bool = True,
+                 cache_path: Optional[str] = None):
         """
         初始化评估器
         
         Args:
             api_key: 阿里云API密钥
+            enable_cache: 是否缓存评估结果（相同内容不重复调用API）
+            cache_path: 缓存数据库路径（默认 logs/evaluation_results/judge_cache.db）
         """
         self.api_key = api_key or os.getenv("DASHSCOPE_API_KEY")
         if not self.api_key:
             print("⚠️  未配置DASHSCOPE_API_KEY，将使用规则评估")
         
         self.api_url = "https://dashscope.aliyuncs.com/compatible-mode/v1/chat/completions"
+        
+        # 缓存命中统计
+        self.stats = {'hits': 0, 'misses': 0}
+        self._cache: Optional[_JudgeCache] = None
+        if self.api_key and enable_cache:
+            if cache_path:
+                db_path = Path(cache_path)
+            else:
+                db_path = _RESULTS_DIR / "judge_cache.db"
+            try:
+                self._cache = _JudgeCache(db_path)
+            except Exception as e:
+                print(f"⚠️  评估缓存不可用: {e}")
+        
+        # 共享的HTTP会话：复用TCP/TLS连接（keep-alive），连接池大小覆盖并发执行的用例
+        self._session: Optional[requests.Session] = None
+        if self.api_key:
+            self._session = requests.Session()
+            self._session.headers.update({
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            })
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=32)
+            self._session.mount("https://", adapter)
+    
+    def close(self):
+        """关闭HTTP会话和评估缓存"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
     
     def evaluate_response(self, test_case: TestCase) -> tuple[bool, str]:
         """
@@ -111,10 +259,20 @@ class QwenEvaluator:
         Returns:
             (是否通过, 评估理由)
         """
-        # 如果没有API Key，使用简单的规则评估
-        if not self.api_key:
+        # 如果没有API Key（或会话已关闭），使用简单的规则评估
+        if self._session is None:
             return self._rule_based_evaluate(test_case)
         
+        # 相同内容的评估直接返回缓存结果
+        cache_key = None
+        if self._cache is not None:
+            cache_key = _JudgeCache.make_key(self.MODEL, test_case)
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self.stats['hits'] += 1
+                return cached
+            self.stats['misses'] += 1
+        
         try:
             # 构建评估提示
             prompt = f"""作为一个AI助手评估专家，请评估以下对话的质量：
@@ -135,14 +293,9 @@ class QwenEvaluator:
 }}
 """
             
-            # 调用Qwen API
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
+            # 调用Qwen API（认证头已设置在会话上）
             data = {
-                "model": "qwen-plus",
+                "model": self.MODEL,
                 "messages": [
                     {"role": "user", "content": prompt}
                 ],
@@ -150,9 +303,8 @@ class QwenEvaluator:
                 "max_tokens": 500
             }
             
-            response = requests.post(
+            response = self._session.post(
                 self.api_url,
-                headers=headers,
                 json=data,
                 timeout=30
             )
@@ -163,14 +315,19 @@ class QwenEvaluator:
                 
                 # 解析JSON响应
                 try:
-                    eval_result = json.loads(content)
-                    return eval_result.get('pass', False), eval_result.get('reason', '未提供理由')
+                    eval_result = _json_loads(content)
+                    verdict = eval_result.get('pass', False), eval_result.get('reason', '未提供理由')
                 except json.JSONDecodeError:
                     # 如果不是JSON，尝试从文本中提取
                     if 'pass' in content.lower() and 'true' in content.lower():
-                        return True, content
+                        verdict = True, content
                     else:
-                        return False, content
+                        verdict = False, content
+                
+                # 只缓存模型给出的评估结果（temperature=0.1，结果基本确定）
+                if cache_key is not None:
+                    self._cache.put(cache_key, *verdict)
+                return verdict
             else:
                 print(f"⚠️  API调用失败: {response.status_code}, 使用规则评估")
                 return self._rule_based_evaluate(test_case)
@@ -179,13 +336,100 @@ class QwenEvaluator:
             print(f"⚠️  评估异常: {e}, 使用规则评估")
             return self._rule_based_evaluate(test_case)
     
+    def evaluate_batch(self, test_cases: List[TestCase]) -> List[tuple[bool, str]]:
+        """
+        在一次API调用中评估多个测试用例
+        
+        缓存命中的用例不再提交；模型未返回结果的用例（或批量调用失败时）逐个调用 evaluate_response
+        
+        Args:
+            test_cases: 测试用例列表
+            
+        Returns:
+            与 test_cases 顺序一致的 (是否通过, 评估理由) 列表
+        """
+        if self._session is None or len(test_cases) <= 1:
+            return [self.evaluate_response(tc) for tc in test_cases]
+        
+        results: List[Optional[tuple[bool, str]]] = [None] * len(test_cases)
+        cache_keys: List[Optional[str]] = [None] * len(test_cases)
+        pending = []
+        for i, tc in enumerate(test_cases):
+            if self._cache is not None:
+                cache_keys[i] = _JudgeCache.make_key(self.MODEL, tc)
+                cached = self._cache.get(cache_keys[i])
+                if cached is not None:
+                    self.stats['hits'] += 1
+                    results[i] = cached
+                    continue
+                self.stats['misses'] += 1
+            pending.append(i)
+        
+        if pending:
+            try:
+                dialogues = "\n".join(
+                    f"[{n}] 用户查询：{test_cases[i].query}\n"
+                    f"    预期响应类型：{test_cases[i].expected_response}\n"
+                    f"    实际系统响应：{test_cases[i].actual_response}"
+                    for n, i in enumerate(pending)
+                )
+                prompt = f"""作为一个AI助手评估专家，请逐条评估以下 {len(pending)} 段对话的质量：
+
+{dialogues}
+
+请判断每段对话的实际响应是否符合预期响应类型的要求。评估标准：
+1. 响应是否理解了用户意图
+2. 响应是否提供了相关的功能或信息
+3. 响应是否符合预期的响应类型
+
+请以JSON数组格式回复，每段对话一个元素，index 为对话编号：
+[
+    {{"index": 0, "pass": true/false, "reason": "评估理由"}}
+]
+"""
+                data = {
+                    "model": self.MODEL,
+                    "messages": [
+                        {"role": "user", "content": prompt}
+                    ],
+                    "temperature": 0.1,
+                    "max_tokens": min(300 * len(pending), 4000)
+                }
+                
+                response = self._session.post(
+                    self.api_url,
+                    json=data,
+                    timeout=60
+                )
+                
+                if response.status_code == 200:
+                    content = response.json()['choices'][0]['message']['content']
+                    # 去掉可能的 Markdown 代码块标记
+                    content = content.strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+                    for item in _json_loads(content):
+                        n = item.get('index')
+                        if isinstance(n, int) and 0 <= n < len(pending) and results[pending[n]] is None:
+                            i = pending[n]
+                            results[i] = item.get('pass', False), item.get('reason', '未提供理由')
+                            if cache_keys[i] is not None:
+                                self._cache.put(cache_keys[i], *results[i])
+                else:
+                    print(f"⚠️  批量评估API调用失败: {response.status_code}, 改为逐个评估")
+                    
+            except Exception as e:
+                print(f"⚠️  批量评估异常: {e}, 改为逐个评估")
+        
+        # 批量结果中缺失的用例逐个评估
+        return [r if r is not None else self.evaluate_response(tc)
+                for r, tc in zip(results, test_cases)]
+    
     def _rule_based_evaluate(self, test_case: TestCase) -> tuple[bool, str]:
         """基于规则的简单评估"""
         if not test_case.actual_response:
             return False, "无响应"
         
         # 检查是否包含错误信息
-        if any(word in test_case.actual_response.lower() for word in ['错误', 'error', '失败', 'failed']):
+        if _ERROR_RE.search(test_case.actual_response):
             return False, "响应包含错误信息"
         
         # 检查响应长度
@@ -196,19 +440,137 @@ class QwenEvaluator:
         return True, "基于规则的简单评估通过"
 
 
+# 已解析的测试用例文件：绝对路径 -> ((修改时间ns, 文件大小), [(query, expected_agent, expected_response, category), ...])
+_parsed_case_cache: Dict[str, tuple[tuple[int, int], List[tuple[str, str, str, str]]]] = {}
+
+
+# 超过该大小的测试用例文件按行边界切块，由多个进程并行解析
+_PARALLEL_PARSE_MIN_BYTES = 16 * 1024 * 1024
+
+
+def _parse_chunk(data: bytes) -> List[tuple[str, str, str, str]]:
+    """解析一段按行对齐的JSONL字节，返回 (query, expected_agent, expected_response, category) 列表"""
+    records = []
+    for line in data.splitlines():
+        line = line.strip()
+        if line:
+            item = _json_loads(line)
+            records.append((
+                item['query'],
+                item['expected_agent'],
+                item['expected_response'],
+                item.get('category', 'unknown')
+            ))
+    return records
+
+
+def _split_lines(data: bytes, parts: int) -> List[bytes]:
+    """将字节按换行符边界切成大致相等的若干块"""
+    chunks = []
+    size = len(data)
+    start = 0
+    for i in range(1, parts):
+        end = data.find(b'\n', max(start, size * i // parts))
+        if end < 0:
+            break
+        chunks.append(data[start:end + 1])
+        start = end + 1
+    chunks.append(data[start:])
+    return chunks
+
+
+def _parse_test_cases(file_path: str) -> List[tuple[str, str, str, str]]:
+    """解析JSONL测试用例文件，返回 (query, expected_agent, expected_response, category) 列表"""
+    # 一次读入整个文件再按行切分（UTF-8字节直接交给JSON解析器，不逐行读取和解码）
+    data = Path(file_path).read_bytes()
+    workers = os.cpu_count() or 1
+    if len(data) < _PARALLEL_PARSE_MIN_BYTES or workers < 2:
+        return _parse_chunk(data)
+    
+    # 大文件：各进程只返回元组（序列化开销小），TestCase 在主进程中构建；
+    # 评估在GUI的工作线程中运行，使用 spawn 启动子进程，避免在多线程进程中 fork
+    records = []
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        for chunk_records in executor.map(_parse_chunk, _split_lines(data, workers)):
+            records.extend(chunk_records)
+    return records
+
+
+class _JudgeBatcher:
+    """
+    评估请求聚合器
+    
+    收集已完成的测试用例，攒满 batch_size 个或等待 max_delay 秒后通过一次批量API调用评估
+    """
+    
+    def __init__(self, judge: QwenEvaluator, batch_size: int, max_delay: float):
+        self._judge = judge
+        self._batch_size = batch_size
+        self._max_delay = max_delay
+        self._pending: List[tuple[TestCase, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+    
+    async def evaluate(self, test_case: TestCase) -> tuple[bool, str]:
+        """提交一个用例并等待所在批次的评估结果"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((test_case, future))
+        if len(self._pending) >= self._batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._max_delay, self._flush)
+        return await future
+    
+    def _flush(self):
+        """将当前收集的用例作为一个批次提交"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.get_running_loop().create_task(self._run_batch(batch))
+    
+    async def _run_batch(self, batch: List[tuple[TestCase, asyncio.Future]]):
+        """在线程中执行阻塞的批量评估，并把结果分发给各个用例"""
+        try:
+            results = await asyncio.to_thread(self._judge.evaluate_batch, [tc for tc, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
 class SystemEvaluator:
     """系统评估器"""
     
-    def __init__(self, controller, qwen_evaluator: Optional[QwenEvaluator] = None):
+    def __init__(self, controller, qwen_evaluator: Optional[QwenEvaluator] = None,
+                 concurrency: int = 1, judge_batch_size: int = 1,
+                 judge_batch_delay: float = 0.5):
         """
         初始化评估器
         
         Args:
             controller: SystemController实例
             qwen_evaluator: Qwen评估器
+            concurrency: 同时执行的测试用例数（默认1，即逐个执行；
+                         多个用例共享同一个控制器和会话栈，并发时需确认流水线支持并行查询）
+            judge_batch_size: 每次评估API调用最多包含的用例数（默认1，即逐个评估）
+            judge_batch_delay: 批次未攒满时最多等待的秒数
         """
         self.controller = controller
         self.qwen_evaluator = qwen_evaluator or QwenEvaluator()
+        self.concurrency = max(1, concurrency)
+        self.judge_batch_size = max(1, judge_batch_size)
+        self.judge_batch_delay = judge_batch_delay
+        self._judge_batcher: Optional[_JudgeBatcher] = None
+        # 本次评估的结果文件：用例逐条追加写入 .jsonl，结束时写入摘要 .json
+        self._results_path: Optional[Path] = None
+        self._results_fp = None
         self.test_cases: List[TestCase] = []
         self.current_case_index = 0
         self.is_running = False
@@ -230,18 +592,19 @@ class SystemEvaluator:
         self.test_cases.clear()
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if line:
-                        data = json.loads(line)
-                        test_case = TestCase(
-                            query=data['query'],
-                            expected_agent=data['expected_agent'],
-                            expected_response=data['expected_response'],
-                            category=data.get('category', 'unknown')
-                        )
-                        self.test_cases.append(test_case)
+            # 文件未变化（路径、修改时间、大小相同）时复用上次解析的结果，不重复解析JSON
+            stat = os.stat(file_path)
+            key = os.path.abspath(file_path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+            cached = _parsed_case_cache.get(key)
+            if cached is not None and cached[0] == signature:
+                records = cached[1]
+            else:
+                records = _parse_test_cases(file_path)
+                _parsed_case_cache[key] = (signature, records)
+            
+            # 运行结果会写回测试用例，每次加载都创建新的对象
+            self.test_cases.extend(TestCase(*record) for record in records)
             
             print(f"✅ 加载了 {len(self.test_cases)} 个测试用例")
             return len(self.test_cases)
@@ -251,7 +614,7 @@ class SystemEvaluator:
             return 0
     
     def run_evaluation(self):
-        """运行评估"""
+        """运行评估（同步接口，内部使用asyncio.run并发执行测试用例）"""
         if not self.test_cases:
             print("❌ 没有测试用例")
             return
@@ -261,27 +624,50 @@ class SystemEvaluator:
             return
         
         self.is_running = True
+        try:
+            asyncio.run(self._run_evaluation_async())
+        finally:
+            self.is_running = False
+    
+    async def _run_evaluation_async(self):
+        """异步运行所有测试用例，由信号量限制同时执行的用例数"""
         self.current_case_index = 0
         start_time = time.time()
+        total = len(self.test_cases)
         
         print(f"\n{'='*80}")
-        print(f"开始评估 - 共 {len(self.test_cases)} 个测试用例")
+        print(f"开始评估 - 共 {total} 个测试用例")
         print(f"{'='*80}\n")
         
-        # 运行所有测试用例
-        for i, test_case in enumerate(self.test_cases):
-            self.current_case_index = i
-            print(f"\n[{i+1}/{len(self.test_cases)}] 测试: {test_case.query}")
+        self._open_results_file()
+        
+        semaphore = asyncio.Semaphore(self.concurrency)
+        if self.judge_batch_size > 1:
+            self._judge_batcher = _JudgeBatcher(
+                self.qwen_evaluator, self.judge_batch_size, self.judge_batch_delay
+            )
+        
+        async def run_case(index: int, test_case: TestCase):
+            async with semaphore:
+                print(f"\n[{index+1}/{total}] 测试: {test_case.query}")
+                await self._run_single_case(test_case)
             
-            # 运行单个用例
-            self._run_single_case(test_case)
+            # 用例完成即写入结果文件，评估中途退出也不会丢失已完成的结果
+            self._append_case_result(test_case)
             
-            # 回调通知
+            # 回调通知（回调在事件循环线程中依次执行）
+            self.current_case_index = index
             if self.on_case_complete:
                 self.on_case_complete(test_case)
-            
-            # 短暂延迟，避免过快
-            time.sleep(0.1)
+        
+        # 启用评估模式（禁用TTS）；并发用例共享该开关，全部完成后再关闭
+        self.controller.evaluation_mode = True
+        try:
+            await asyncio.gather(*(run_case(i, tc) for i, tc in enumerate(self.test_cases)))
+        finally:
+            self.controller.evaluation_mode = False
+            self._judge_batcher = None
+            self._close_results_file()
         
         # 计算统计结果
         end_time = time.time()
@@ -296,10 +682,8 @@ class SystemEvaluator:
         # 完成回调
         if self.on_all_complete:
             self.on_all_complete(result)
-        
-        self.is_running = False
     
-    def _run_single_case(self, test_case: TestCase):
+    async def _run_single_case(self, test_case: TestCase):
         """运行单个测试用例"""
         case_start = time.time()
         
@@ -315,9 +699,6 @@ class SystemEvaluator:
             test_case.msg_id = msg_id
             tracker.update_query(msg_id, test_case.query)
             
-            # 启用评估模式（禁用TTS）
-            self.controller.evaluation_mode = True
-            
             # 模拟文本输入 - 发布ASR识别成功事件
             event = Event.create(
                 event_type=EventType.ASR_RECOGNITION_SUCCESS,
@@ -333,21 +714,9 @@ class SystemEvaluator:
             # 发布事件
             self.controller.publish_event(event)
             
-            # 等待agent处理完成 - 轮询检查trace是否有响应（最多等待5秒）
-            max_wait = 5.0  # 最多等待5秒
-            check_interval = 0.1  # 每100ms检查一次
-            elapsed = 0
-            
-            while elapsed < max_wait:
-                time.sleep(check_interval)
-                elapsed += check_interval
-                
-                # 检查是否有响应
-                trace = tracker.get_trace(msg_id)
-                if trace and trace.response:
-                    # 有响应了，等待一点让所有trace记录完成
-                    time.sleep(0.2)
-                    break
+            # 等待agent处理完成 - 由追踪器在整条消息追踪完成时唤醒（最多等待5秒）
+            max_wait = 5.0
+            await asyncio.to_thread(tracker.wait_for_completion, msg_id, max_wait)
             
             # 获取最终追踪结果
             trace = tracker.get_trace(msg_id)
@@ -366,9 +735,14 @@ class SystemEvaluator:
                 # 评估Agent匹配
                 test_case.agent_match = (test_case.actual_agent == test_case.expected_agent)
                 
-                # 使用Qwen评估响应
-                test_case.response_pass, test_case.evaluation_reason = \
-                    self.qwen_evaluator.evaluate_response(test_case)
+                # 使用Qwen评估响应（阻塞的HTTP调用放到线程中执行，不阻塞其他用例；
+                # 启用批量评估时与其他已完成的用例合并为一次调用）
+                if self._judge_batcher is not None:
+                    test_case.response_pass, test_case.evaluation_reason = \
+                        await self._judge_batcher.evaluate(test_case)
+                else:
+                    test_case.response_pass, test_case.evaluation_reason = \
+                        await asyncio.to_thread(self.qwen_evaluator.evaluate_response, test_case)
                 
                 # 记录耗时
                 test_case.duration_ms = trace.duration_ms
@@ -390,29 +764,36 @@ class SystemEvaluator:
             traceback.print_exc()
         
         finally:
-            # 关闭评估模式
-            self.controller.evaluation_mode = False
-            
             if test_case.duration_ms is None:
                 test_case.duration_ms = (time.time() - case_start) * 1000
     
     def _calculate_results(self, start_time: float, end_time: float) -> EvaluationResult:
         """计算评估结果"""
         total = len(self.test_cases)
-        passed = sum(1 for tc in self.test_cases if tc.passed)
+        
+        # 一次遍历累计各项统计
+        passed = agent_correct = response_passed = duration_count = 0
+        duration_sum = 0.0
+        for tc in self.test_cases:
+            if tc.passed:
+                passed += 1
+            if tc.agent_match:
+                agent_correct += 1
+            if tc.response_pass:
+                response_passed += 1
+            if tc.duration_ms is not None:
+                duration_sum += tc.duration_ms
+                duration_count += 1
         failed = total - passed
         
         # Agent准确率
-        agent_correct = sum(1 for tc in self.test_cases if tc.agent_match)
         agent_accuracy = agent_correct / total if total > 0 else 0.0
         
         # 响应通过率
-        response_passed = sum(1 for tc in self.test_cases if tc.response_pass)
         response_pass_rate = response_passed / total if total > 0 else 0.0
         
         # 平均耗时
-        durations = [tc.duration_ms for tc in self.test_cases if tc.duration_ms is not None]
-        avg_duration = sum(durations) / len(durations) if durations else 0.0
+        avg_duration = duration_sum / duration_count if duration_count else 0.0
         
         return EvaluationResult(
             total_cases=total,
@@ -440,20 +821,54 @@ class SystemEvaluator:
         print(f"总耗时: {result.duration_seconds:.2f}s")
         print(f"{'='*80}\n")
     
+    def _open_results_file(self):
+        """创建本次评估的用例结果文件（JSONL，逐条追加）"""
+        try:
+            _RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            self._results_path = _RESULTS_DIR / f"evaluation_{timestamp}"
+            self._results_fp = open(self._results_path.with_suffix('.jsonl'), 'ab')
+        except Exception as e:
+            self._results_path = None
+            self._results_fp = None
+            print(f"⚠️  创建结果文件失败: {e}")
+    
+    def _append_case_result(self, test_case: TestCase):
+        """追加写入一条用例结果"""
+        if self._results_fp is None:
+            return
+        try:
+            self._results_fp.write(_json_line(test_case.to_dict()))
+            self._results_fp.flush()
+        except Exception as e:
+            print(f"⚠️  写入用例结果失败: {e}")
+    
+    def _close_results_file(self):
+        """关闭用例结果文件"""
+        if self._results_fp is not None:
+            try:
+                self._results_fp.close()
+            finally:
+                self._results_fp = None
+    
     def _save_results(self, result: EvaluationResult):
-        """保存评估结果"""
+        """保存评估结果摘要（各用例结果已在运行过程中写入同名 .jsonl 文件）"""
         try:
-            # 创建结果目录
-            results_dir = Path(__file__).parent.parent.parent / "logs" / "evaluation_results"
-            results_dir.mkdir(parents=True, exist_ok=True)
+            if self._results_path is None:
+                _RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                self._results_path = _RESULTS_DIR / f"evaluation_{timestamp}"
+            result_file = self._results_path.with_suffix('.json')
             
-            # 生成文件名
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            result_file = results_dir / f"evaluation_{timestamp}.json"
+            summary = result.to_dict(include_cases=False)
+            summary['test_cases_file'] = self._results_path.with_suffix('.jsonl').name
             
             # 保存为JSON
-            with open(result_file, 'w', encoding='utf-8') as f:
-                json.dump(result.to_dict(), f, ensure_ascii=False, indent=2)
+            if orjson is not None:
+                result_file.write_bytes(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+            else:
+                with open(result_file, 'w', encoding='utf-8') as f:
+                    json.dump(summary, f, ensure_ascii=False, indent=2)
             
             print(f"📝 评估结果已保存: {result_file}")
             
@@ -5,6 +5,7 @@
 """
 import asyncio
 from . import get_tool_registry, get_vehicle_state
+from .tool_registry import ToolCategory
 
 
 class VehicleConsole:
@@ -14,6 +15,23 @@ class VehicleConsole:
         self.registry = get_tool_registry()
         self.vehicle = get_vehicle_state()
         self.running = True
+        # 按分类分组并排序好的工具列表（工具数量变化时重建）
+        self._tools_by_category = None
+        self._tools_by_category_size = -1
+    
+    def _get_tools_by_category(self):
+        """获取按分类分组的工具：{分类: [按名称排序的工具]}，分类按名称排序"""
+        size = len(self.registry.tools)
+        if self._tools_by_category is None or self._tools_by_category_size != size:
+            # 直接使用注册中心的分类索引，不遍历全部工具
+            by_category = {}
+            for category in sorted(ToolCategory, key=lambda c: c.value):
+                tools = self.registry.get_tools_by_category(category)
+                if tools:
+                    by_category[category.value] = sorted(tools, key=lambda t: t.name)
+            self._tools_by_category = by_category
+            self._tools_by_category_size = size
+        return self._tools_by_category
     
     def print_header(self):
         """打印标题"""
@@ -40,18 +58,10 @@ class VehicleConsole:
         print("所有工具列表")
         print("=" * 70)
         
-        by_category = {}
-        for tool in self.registry.tools.values():
-            cat = tool.category.value
-            if cat not in by_category:
-                by_category[cat] = []
-            by_category[cat].append(tool.name)
-        
-        for cat in sorted(by_category.keys()):
-            print(f"\n【{cat}】 ({len(by_category[cat])}个工具)")
-            for name in sorted(by_category[cat]):
-                tool = self.registry.get_tool(name)
-                print(f"  • {name:<30} - {tool.description}")
+        for cat, tools in self._get_tools_by_category().items():
+            print(f"\n【{cat}】 ({len(tools)}个工具)")
+            for tool in tools:
+                print(f"  • {tool.name:<30} - {tool.description}")
     
     def list_by_category(self):
         """按分类查看工具"""
@@ -78,11 +88,11 @@ class VehicleConsole:
         choice = input("\n请选择分类 (1-13): ").strip()
         if choice in categories:
             cat_id, cat_name = categories[choice]
-            tools = [t for t in self.registry.tools.values() if t.category.value == cat_id]
+            tools = self._get_tools_by_category().get(cat_id, [])
             
             print(f"\n【{cat_name}】 共{len(tools)}个工具")
             print("-" * 70)
-            for tool in sorted(tools, key=lambda t: t.name):
+            for tool in tools:
                 print(f"  • {tool.name:<30} - {tool.description}")
                 if tool.parameters:
                     print(f"    参数: {', '.join(p.name for p in tool.parameters)}")
@@ -219,13 +229,16 @@ class VehicleConsole:
     async def scenario_comfort(self):
         """场景2: 舒适模式"""
         print("\n😊 开启舒适模式...")
-        await self.registry.get_tool("turn_on_ac").execute()
+        # 各项设置互不依赖，并发执行
+        await asyncio.gather(
+            self.registry.get_tool("turn_on_ac").execute(),
+            self.registry.get_tool("set_temperature").execute(zone="all", temperature=24),
+            self.registry.get_tool("play_music").execute(),
+            self.registry.get_tool("set_volume").execute(volume=50),
+        )
         print("  ✓ 空调已开启")
-        await self.registry.get_tool("set_temperature").execute(zone="all", temperature=24)
         print("  ✓ 温度设置为24℃")
-        await self.registry.get_tool("play_music").execute()
         print("  ✓ 音乐播放中")
-        await self.registry.get_tool("set_volume").execute(volume=50)
         print("  ✓ 音量50")
         print("✅ 舒适模式已开启")
     
@@ -241,11 +254,14 @@ class VehicleConsole:
     async def scenario_adas(self):
         """场景4: 驾驶辅助"""
         print("\n🛡️  开启驾驶辅助...")
-        await self.registry.get_tool("enable_lane_assist").execute()
+        # 各项辅助功能互不依赖，并发开启
+        await asyncio.gather(
+            self.registry.get_tool("enable_lane_assist").execute(),
+            self.registry.get_tool("enable_blind_spot_monitor").execute(),
+            self.registry.get_tool("enable_collision_warning").execute(),
+        )
         print("  ✓ 车道保持")
-        await self.registry.get_tool("enable_blind_spot_monitor").execute()
         print("  ✓ 盲区监测")
-        await self.registry.get_tool("enable_collision_warning").execute()
         print("  ✓ 碰撞预警")
         print("✅ 驾驶辅助已开启")
     
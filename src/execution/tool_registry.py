@@ -108,6 +108,8 @@ class ToolRegistry:
     
     def __init__(self):
         self.tools: Dict[str, Tool] = {}
+        # 分类索引：注册时维护，按分类查询时无需遍历全部工具
+        self._tools_by_category: Dict[ToolCategory, List[Tool]] = {}
         self._initialize_tools()
     
     def _initialize_tools(self):
@@ -118,16 +120,43 @@ class ToolRegistry:
     
     def register_tool(self, tool: Tool):
         """注册工具"""
+        old = self.tools.get(tool.name)
         self.tools[tool.name] = tool
+        
+        # 同名工具重新注册时，在分类索引中原位替换（保持与 tools 相同的顺序）
+        if old is not None:
+            old_list = self._tools_by_category[old.category]
+            if old.category == tool.category:
+                old_list[old_list.index(old)] = tool
+                return
+            old_list.remove(old)
+        self._tools_by_category.setdefault(tool.category, []).append(tool)
     
     def get_tool(self, name: str) -> Optional[Tool]:
         """获取工具"""
         return self.tools.get(name)
     
+    def get_tools_by_category(self, category) -> List[Tool]:
+        """
+        获取某个分类下的工具（按注册顺序）
+        
+        Args:
+            category: 工具分类（ToolCategory 或其取值字符串）
+            
+        Returns:
+            工具列表，未知分类返回空列表
+        """
+        if not isinstance(category, ToolCategory):
+            try:
+                category = ToolCategory(category)
+            except ValueError:
+                return []
+        return list(self._tools_by_category.get(category, ()))
+    
     def list_tools(self, category: Optional[ToolCategory] = None) -> List[Tool]:
         """列出工具"""
         if category:
-            return [t for t in self.tools.values() if t.category == category]
+            return list(self._tools_by_category.get(category, ()))
         return list(self.tools.values())
     
     def get_mcp_tools(self) -> List[Dict]:
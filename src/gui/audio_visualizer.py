@@ -344,7 +344,8 @@ class AudioVisualizerWidget(QWidget):
                     model=config.asr.settings['model'],
                     language=config.asr.settings['language'],
                     model_size='base',
-                    device='auto'  # 自动选择最佳设备（MPS/CUDA/CPU）
+                    device='auto',  # 自动选择最佳设备（MPS/CUDA/CPU）
+                    chunk_duration=config.asr.settings.get('chunk_duration', 0.0)
                 )
                 self.asr_engine = create_asr_engine(asr_config)
                 print("✅ ASR 引擎就绪")
@@ -504,18 +504,18 @@ class KiwiVoiceAssistantGUI(QWidget):
                 tracker.update_query(msg_id, text)
                 
                 # 创建 ASR 识别成功事件（使用新的 Payload 模式）
-                from src.core.events import ASREvent, ASRPayload
+                from src.core.events import ASRPayload
                 
-                event = ASREvent(
-                    event_type=EventType.ASR_RECOGNITION_SUCCESS,
-                    source="gui_test",
-                    payload=ASRPayload(
+                event = Event.of(
+                    "gui_test",
+                    ASRPayload(
                         text=text,
                         confidence=1.0,
                         is_partial=False,
                         latency_ms=0.0
                     ),
-                    msg_id=msg_id
+                    msg_id,
+                    event_type=EventType.ASR_RECOGNITION_SUCCESS
                 )
                 
                 # 发布事件到系统（这会触发orchestrator → agent → TTS的处理链）
@@ -576,7 +576,8 @@ class KiwiVoiceAssistantGUI(QWidget):
                 model=config.asr.settings['model'],
                 language=config.asr.settings['language'],
                 model_size=config.asr.settings.get('size', 'base'),
-                device='auto'
+                device='auto',
+                chunk_duration=config.asr.settings.get('chunk_duration', 0.0)
             )
             
             # 3. 创建并注册模块
@@ -4,7 +4,7 @@ import ollama
 import chromadb
 from chromadb.config import Settings
 from typing import List, Optional, Dict, Any
-from src.core.types import ShortTermMemory, LongTermMemory
+from src.core.types import ShortTermMemory, ShortTermMemoryRecord, LongTermMemory
 
 
 
@@ -135,7 +135,7 @@ class MemoryManager:
             response=event.get('response', ''),
             timestamp=event.get('timestamp', time.time()),
             agent=event.get('agent', ''),
-            tools_used=event.get('tools_used', []),
+            tools_used=event.get('tools_used') or (),
             description=f"用户查询: {event.get('query', '')} | 系统响应: {event.get('response', '')}",
             success=event.get('success', True),
             metadata=event.get('data', {})
@@ -237,7 +237,7 @@ class MemoryManager:
             return []
     
     def _retrieve_memories_by_similarity(self, query: str, collection, max_count: int = 5, 
-                                       similarity_threshold: float = 0.7) -> List[ShortTermMemory]:
+                                       similarity_threshold: float = 0.7) -> List[ShortTermMemoryRecord]:
         """基于向量相似度检索记忆
         
         Args:
@@ -248,7 +248,7 @@ class MemoryManager:
                                  默认0.7表示只返回相似度>0.7的结果
             
         Returns:
-            短期记忆列表
+            短期记忆检索记录列表（无法检索时回退为最近的 ShortTermMemory，字段相同）
         """
         try:
             # 生成query的embedding
@@ -264,8 +264,9 @@ class MemoryManager:
                 n_results=max_count * 2  # 查询2倍数量，便于阈值过滤后还有足够结果
             )
             
-            # 转换为ShortTermMemory对象，并应用相似度阈值
+            # 转换为只读的ShortTermMemoryRecord，并应用相似度阈值
             memories = []
+            similarities = []  # 与 memories 一一对应的相似度，供下面打印使用
             if results['metadatas'] and results['metadatas'][0] and results['distances']:
                 for i, metadata in enumerate(results['metadatas'][0]):
                     distance = results['distances'][0][i]
@@ -284,32 +285,23 @@ class MemoryManager:
                     if len(memories) >= max_count:
                         break
                     
-                    memory = ShortTermMemory(
+                    memory = ShortTermMemoryRecord(
                         query=metadata.get('query', ''),
                         response=metadata.get('response', ''),
                         timestamp=metadata.get('timestamp', 0),
                         agent=metadata.get('agent', ''),
-                        tools_used=[],
                         description=f"用户查询: {metadata.get('query', '')} | 系统响应: {metadata.get('response', '')}",
-                        success=metadata.get('success', True),
-                        metadata={}
+                        success=metadata.get('success', True)
                     )
                     memories.append(memory)
+                    similarities.append(similarity)
             
             print(f"🔍 基于语义相似度检索到 {len(memories)} 条相关记忆 (阈值: {similarity_threshold})")
             print(f"   查询内容: {query}")
             # 打印召回的内容和相似度分数
-            if memories:
-                for i, memory in enumerate(memories):
-                    # 需要找到这个memory在原始results中的位置
-                    for j, metadata in enumerate(results['metadatas'][0]):
-                        if (metadata.get('timestamp') == memory.timestamp and 
-                            metadata.get('query') == memory.query):
-                            distance = results['distances'][0][j]
-                            similarity = 1 - distance
-                            print(f"   {i+1}. [{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(memory.timestamp))}] "
-                                  f"用户: {memory.query[:50]}... | 相似度: {similarity:.4f}")
-                            break
+            for i, (memory, similarity) in enumerate(zip(memories, similarities)):
+                print(f"   {i+1}. [{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(memory.timestamp))}] "
+                      f"用户: {memory.query[:50]}... | 相似度: {similarity:.4f}")
             return memories
             
         except Exception as e:
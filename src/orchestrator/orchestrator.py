@@ -8,7 +8,7 @@ import time
 from typing import Optional, Dict, Any, TYPE_CHECKING, Tuple
 from src.core.types import OrchestratorContext, OrchestratorInput, OrchestratorDecision, QueryType, SystemState, AgentInfo
 from .llm_decision import LLMDecisionMaker, MockLLMDecisionMaker
-from src.core.types import ShortTermMemory, LongTermMemory
+from src.core.types import ShortTermMemory, LongTermMemory, EMPTY_MAPPING
 from src.core.session_manager import get_session_manager
 
 if TYPE_CHECKING:
@@ -108,7 +108,7 @@ class Orchestrator:
                 query_type=query_type,
                 query_content=query_content,
                 timestamp=time.time(),
-                metadata=metadata or {}
+                metadata=metadata or EMPTY_MAPPING
             )
             
             # 3. 从memory模块召回短期记忆（对话历史）
@@ -3,7 +3,7 @@ ASR 模块测试示例
 """
 import numpy as np
 import time
-from src.asr import create_asr_engine, ASRConfig
+from src.asr import create_asr_engine, ASRConfig, WhisperEngine
 
 
 def generate_test_audio(duration: float = 3.0, sample_rate: int = 16000) -> np.ndarray:
@@ -176,6 +176,60 @@ def test_config_validation():
     print()
 
 
+def _make_chunked_engine(chunk_duration: float):
+    """构造不加载模型的 Whisper 引擎，_transcribe 替换为按块返回固定结果的桩函数"""
+    engine = WhisperEngine.__new__(WhisperEngine)
+    engine.config = ASRConfig(chunk_duration=chunk_duration)
+    chunk_lengths = []
+    
+    def fake_transcribe(audio):
+        n = len(chunk_lengths)
+        chunk_lengths.append(len(audio))
+        return {
+            "text": f"第{n}块",
+            "language": "zh",
+            "segments": [{"id": 0, "start": 0.1, "end": 0.5, "text": f"第{n}块"}],
+        }
+    
+    engine._transcribe = fake_transcribe
+    return engine, chunk_lengths
+
+
+def test_transcribe_chunked():
+    """测试长音频分块识别的分段偏移和文本合并"""
+    print("=== 测试分块识别 ===\n")
+    
+    engine, chunk_lengths = _make_chunked_engine(chunk_duration=1.0)
+    audio = np.zeros(int(2.5 * 16000), dtype=np.int16)
+    
+    result, duration = engine._transcribe_chunked(audio, 16000, 16000)
+    
+    assert chunk_lengths == [16000, 16000, 8000]
+    assert duration == 2.5
+    assert result["text"] == "第0块第1块第2块"
+    assert result["language"] == "zh"
+    # 分段时间按所在块的起始位置平移
+    assert [seg["start"] for seg in result["segments"]] == [0.1, 1.1, 2.1]
+    assert [seg["end"] for seg in result["segments"]] == [0.5, 1.5, 2.5]
+    
+    # 过短的尾块不送识别，但计入总时长
+    engine, chunk_lengths = _make_chunked_engine(chunk_duration=1.0)
+    audio = np.zeros(int(2.05 * 16000), dtype=np.float32)
+    result, duration = engine._transcribe_chunked(audio, 16000, 16000)
+    assert chunk_lengths == [16000, 16000]
+    assert abs(duration - 2.05) < 1e-9
+    assert result["text"] == "第0块第1块"
+    
+    # recognize 在音频超过分块时长时走分块路径
+    engine, chunk_lengths = _make_chunked_engine(chunk_duration=1.0)
+    asr_result = engine.recognize(np.zeros(int(1.5 * 16000), dtype=np.float32), sample_rate=16000)
+    assert chunk_lengths == [16000, 8000]
+    assert asr_result.text == "第0块第1块"
+    assert [seg.start for seg in asr_result.segments] == [0.1, 1.1]
+    
+    print("✅ 分块识别测试通过\n")
+
+
 if __name__ == "__main__":
     try:
         # 测试配置验证
@@ -2,7 +2,10 @@
 录音模块测试示例
 """
 import time
+import numpy as np
+import pytest
 from src.audio import AudioRecorder, AudioConfig
+from src.audio import recorder as recorder_module
 
 
 def test_basic_usage():
@@ -153,6 +156,137 @@ def test_context_manager():
     print("已自动停止\n")
 
 
+def _make_ring_recorder(monkeypatch):
+    """构造不打开音频设备的录音器（环形缓冲区 3 帧），返回录音器和音频回调"""
+    monkeypatch.setattr(recorder_module.sd, 'query_devices',
+                        lambda *args, **kwargs: {'name': 'test-device'})
+    config = AudioConfig(sample_rate=16000, channels=1, chunk_size=4096, buffer_size=1)
+    recorder = AudioRecorder(config)
+    recorder._is_recording = True
+    return recorder, recorder._make_audio_callback()
+
+
+def _push_frame(recorder, callback, value):
+    """模拟 PortAudio 回调写入一帧 int16 数据"""
+    chunk_size = recorder.config.chunk_size
+    indata = np.full((chunk_size, recorder.config.channels), value, dtype=np.int16)
+    callback(indata, chunk_size, None, None)
+
+
+def test_ring_buffer_wraparound(monkeypatch):
+    """测试环形缓冲区跨越末尾后的读写顺序和数据"""
+    recorder, callback = _make_ring_recorder(monkeypatch)
+    assert recorder._capacity == 3
+    
+    _push_frame(recorder, callback, 100)
+    _push_frame(recorder, callback, 200)
+    assert [recorder.read(timeout=0.1).frame_id for _ in range(2)] == [0, 1]
+    
+    # 写入位置从最后一个槽位绕回到开头
+    for value in (300, 400, 500):
+        _push_frame(recorder, callback, value)
+    for frame_id, value in zip((2, 3, 4), (300, 400, 500)):
+        frame = recorder.read(timeout=0.1)
+        assert frame.frame_id == frame_id
+        assert np.all(frame.data == np.float32(value / 32768.0))
+    
+    assert recorder.get_status().dropped_frames == 0
+    with pytest.raises(TimeoutError):
+        recorder.read(timeout=0.01)
+
+
+def test_ring_buffer_overflow(monkeypatch):
+    """测试缓冲区满时丢弃新帧，已缓存的帧保持不变"""
+    recorder, callback = _make_ring_recorder(monkeypatch)
+    
+    for value in (1, 2, 3, 4, 5):
+        _push_frame(recorder, callback, value)
+    
+    status = recorder.get_status()
+    assert status.dropped_frames == 2
+    assert status.frames_captured == 3
+    assert status.buffer_usage == 1.0
+    
+    frames = [recorder.read(timeout=0.1) for _ in range(3)]
+    assert [frame.frame_id for frame in frames] == [0, 1, 2]
+    assert [frame.data[0] * 32768.0 for frame in frames] == [1.0, 2.0, 3.0]
+    
+    # 读空后继续写入，帧序号接着已写入的帧递增
+    _push_frame(recorder, callback, 6)
+    frame = recorder.read(timeout=0.1)
+    assert frame.frame_id == 3
+    assert frame.data[0] * 32768.0 == 6.0
+
+
+def test_frame_pool_reuse(monkeypatch):
+    """测试归还的音频帧被复用，且复用后不残留上一帧的数据"""
+    recorder, callback = _make_ring_recorder(monkeypatch)
+    
+    _push_frame(recorder, callback, 100)
+    first = recorder.read(timeout=0.1)
+    kept = first.data.copy()
+    recorder.release(first)
+    
+    _push_frame(recorder, callback, 200)
+    second = recorder.read(timeout=0.1)
+    assert second is first
+    assert second.frame_id == 1
+    assert np.all(second.data == np.float32(200 / 32768.0))
+    assert np.all(kept == np.float32(100 / 32768.0))
+    
+    # 零拷贝视图不归还对象池
+    pool_size = len(recorder._frame_pool)
+    recorder.release(recorder._view_frames[0])
+    assert len(recorder._frame_pool) == pool_size
+
+
+def test_stop_with_outstanding_batch(monkeypatch):
+    """测试批次未释放时停止并重新开始录音，读位置不会超过写位置"""
+    recorder, callback = _make_ring_recorder(monkeypatch)
+    window_s = 2 * recorder.config.chunk_size / recorder.config.sample_rate
+    
+    _push_frame(recorder, callback, 100)
+    _push_frame(recorder, callback, 200)
+    batches = recorder.stream_batches(window_s)
+    batch = next(batches)
+    assert batch.size == 2 * recorder.config.chunk_size
+    
+    # 消费者仍持有批次时停止录音，随后重新开始并写入新数据
+    recorder.stop()
+    recorder._is_recording = True
+    _push_frame(recorder, callback, 300)
+    
+    # 恢复生成器：已失效的批次不再推进读位置（录音已停止，生成器随即结束）
+    recorder._is_recording = False
+    with pytest.raises(StopIteration):
+        next(batches)
+    recorder._is_recording = True
+    
+    assert recorder._head == 0
+    frame = recorder.read(timeout=0.1)
+    assert frame.frame_id == 2
+    assert frame.data[0] * 32768.0 == 300.0
+
+
+def test_stop_during_zero_copy_callback(monkeypatch):
+    """测试零拷贝回调执行期间停止并重新开始录音，新数据不会被跳过"""
+    recorder, callback = _make_ring_recorder(monkeypatch)
+    _push_frame(recorder, callback, 100)
+    
+    def on_frame(frame):
+        assert frame.frame_id == 0
+        recorder.stop()
+        recorder._is_recording = True
+        _push_frame(recorder, callback, 200)
+    
+    recorder._deliver_frame_view(on_frame, timeout=0.1)
+    
+    assert recorder._head == 0
+    frame = recorder.read(timeout=0.1)
+    assert frame.frame_id == 1
+    assert frame.data[0] * 32768.0 == 200.0
+
+
 if __name__ == "__main__":
     # 运行所有测试
     try:
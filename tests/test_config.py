@@ -47,6 +47,20 @@ def test_module_toggle():
     print()
 
 
+def test_memory_toggle_persisted(tmp_path):
+    """测试 Memory 模块开关写回配置文件"""
+    config_path = tmp_path / "system_config.yaml"
+    config_path.write_text(get_config_manager().config_path.read_text(encoding='utf-8'), encoding='utf-8')
+
+    manager = ConfigManager(str(config_path))
+    manager.enable_module('memory', False)
+    manager.flush()
+
+    reloaded = ConfigManager(str(config_path))
+    assert reloaded.config.memory.enabled is False
+    assert reloaded.config.memory.settings == manager.config.memory.settings
+
+
 def test_get_config():
     """测试获取配置"""
     print("=== 测试获取配置 ===\n")
@@ -0,0 +1,160 @@
+"""
+评估系统测试
+
+测试评估模型调用的缓存和批量评估（使用模拟的HTTP会话，不访问真实API）
+"""
+import asyncio
+import tempfile
+from pathlib import Path
+
+from src.evaluation import evaluator
+
+
+class _FakeResponse:
+    """模拟评估模型API的响应"""
+    
+    def __init__(self, content):
+        self.status_code = 200 if content is not None else 500
+        self._content = content
+    
+    def json(self):
+        return {'choices': [{'message': {'content': self._content}}]}
+
+
+class _FakeJudgeSession:
+    """记录请求并按顺序返回预设内容的HTTP会话（内容为 None 时返回 500）"""
+    
+    def __init__(self, contents):
+        self.contents = list(contents)
+        self.requests = []
+    
+    def post(self, url, json=None, timeout=None):
+        self.requests.append(json)
+        return _FakeResponse(self.contents.pop(0))
+    
+    def close(self):
+        pass
+
+
+def _make_judge(session, **kwargs) -> evaluator.QwenEvaluator:
+    """创建使用模拟HTTP会话的评估器"""
+    judge = evaluator.QwenEvaluator(api_key="test-key", **kwargs)
+    judge._session.close()
+    judge._session = session
+    return judge
+
+
+def _make_case(query: str, actual_response: str) -> evaluator.TestCase:
+    return evaluator.TestCase(
+        query=query,
+        expected_agent="vehicle_agent",
+        expected_response="确认执行车辆控制",
+        category="vehicle",
+        actual_response=actual_response
+    )
+
+
+def test_judge_cache(tmp_path):
+    """测试评估结果缓存的命中与未命中"""
+    print("\n" + "="*60)
+    print("测试1: 评估结果缓存")
+    print("="*60)
+    
+    cache_path = str(tmp_path / "judge_cache.db")
+    session = _FakeJudgeSession([
+        '{"pass": true, "reason": "符合预期"}',
+        '{"pass": false, "reason": "未执行操作"}',
+    ])
+    judge = _make_judge(session, cache_path=cache_path)
+    test_case = _make_case("打开空调", "已为您打开空调")
+    
+    assert judge.evaluate_response(test_case) == (True, "符合预期")
+    assert judge.evaluate_response(test_case) == (True, "符合预期")
+    assert len(session.requests) == 1
+    assert judge.stats == {'hits': 1, 'misses': 1}
+    
+    # 实际响应不同则缓存键不同，需要重新评估
+    changed = _make_case("打开空调", "好的")
+    assert judge.evaluate_response(changed) == (False, "未执行操作")
+    assert len(session.requests) == 2
+    judge.close()
+    
+    # 缓存持久化在SQLite中，新的评估器直接命中，不调用API
+    reopened = _make_judge(_FakeJudgeSession([]), cache_path=cache_path)
+    assert reopened.evaluate_response(test_case) == (True, "符合预期")
+    assert reopened.stats == {'hits': 1, 'misses': 0}
+    reopened.close()
+    
+    print("\n✅ 评估结果缓存测试通过")
+
+
+def test_judge_batch_fallback():
+    """测试批量评估缺失结果或调用失败时改为逐个评估"""
+    print("\n" + "="*60)
+    print("测试2: 批量评估回退")
+    print("="*60)
+    
+    cases = [_make_case("打开空调", "已为您打开空调"), _make_case("打开车窗", "已打开车窗")]
+    
+    # 批量结果缺少第二条：只对缺失的用例单独调用
+    session = _FakeJudgeSession([
+        '```json\n[{"index": 0, "pass": true, "reason": "批量通过"}]\n```',
+        '{"pass": false, "reason": "逐个评估"}',
+    ])
+    judge = _make_judge(session, enable_cache=False)
+    assert judge.evaluate_batch(cases) == [(True, "批量通过"), (False, "逐个评估")]
+    assert len(session.requests) == 2
+    single_prompt = session.requests[1]['messages'][0]['content']
+    assert "打开车窗" in single_prompt and "打开空调" not in single_prompt
+    judge.close()
+    
+    # 批量调用失败：全部逐个评估
+    session = _FakeJudgeSession([
+        None,
+        '{"pass": true, "reason": "第一条"}',
+        '{"pass": true, "reason": "第二条"}',
+    ])
+    judge = _make_judge(session, enable_cache=False)
+    assert judge.evaluate_batch(cases) == [(True, "第一条"), (True, "第二条")]
+    assert len(session.requests) == 3
+    judge.close()
+    
+    print("\n✅ 批量评估回退测试通过")
+
+
+def test_judge_batcher():
+    """测试评估请求按批次大小和等待时间聚合"""
+    print("\n" + "="*60)
+    print("测试3: 评估请求聚合")
+    print("="*60)
+    
+    class RecordingJudge:
+        def __init__(self):
+            self.batches = []
+        
+        def evaluate_batch(self, test_cases):
+            self.batches.append([tc.query for tc in test_cases])
+            return [(True, tc.query) for tc in test_cases]
+    
+    judge = RecordingJudge()
+    cases = [_make_case(f"查询{i}", "好的") for i in range(3)]
+    
+    async def run():
+        batcher = evaluator._JudgeBatcher(judge, batch_size=2, max_delay=0.05)
+        return await asyncio.gather(*(batcher.evaluate(tc) for tc in cases))
+    
+    results = asyncio.run(run())
+    
+    # 前两条攒满一批立即提交，第三条在等待超时后单独成批
+    assert judge.batches == [["查询0", "查询1"], ["查询2"]]
+    assert results == [(True, "查询0"), (True, "查询1"), (True, "查询2")]
+    
+    print("\n✅ 评估请求聚合测试通过")
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_judge_cache(Path(tmp_dir))
+    test_judge_batch_fallback()
+    test_judge_batcher()
+    print("\n✅ 所有测试完成!")
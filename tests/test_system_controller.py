@@ -8,6 +8,11 @@ from src.core import (
     SystemController, Event, EventType,
     IModule
 )
+import pytest
+from src.core.events import (
+    AudioFrameEvent, ConversationEvent, SessionAction,
+    WakewordPayload, ASRPayload, StateChangePayload
+)
 
 
 class DummyModule(IModule):
@@ -248,6 +253,103 @@ def test_state_integration():
     print("\n✅ 状态机集成测试通过")
 
 
+def test_audio_frame_event_pool():
+    """测试音频帧事件对象池复用时不残留上一帧的状态"""
+    print("\n" + "="*60)
+    print("测试7: 音频帧事件对象池")
+    print("="*60)
+    
+    controller = SystemController(debug=False)
+    received = []
+    
+    def on_frame(event):
+        # 订阅者只在回调中同步读取字段
+        payload = event.payload
+        received.append((event.source, payload.frame_data, payload.sample_rate, payload.channels))
+    
+    controller.subscribe(EventType.AUDIO_FRAME_READY, on_frame)
+    AudioFrameEvent._pool.clear()
+    
+    first = AudioFrameEvent.acquire(source="audio", frame_data=b"frame-1", sample_rate=16000, channels=2)
+    first_payload = first.payload
+    controller.publish_event(first)
+    first.release()
+    
+    # 归还后不再持有帧数据
+    assert first.payload.frame_data == b""
+    
+    second = AudioFrameEvent.acquire(source="mic", frame_data=b"frame-2", sample_rate=8000)
+    assert second is first
+    assert second.payload is first_payload
+    controller.publish_event(second)
+    
+    # 池为空时新建，不会把仍在使用的事件交出去
+    third = AudioFrameEvent.acquire(source="audio", frame_data=b"frame-3", sample_rate=16000)
+    assert third is not second
+    controller.publish_event(third)
+    second.release()
+    third.release()
+    
+    assert received == [
+        ("audio", b"frame-1", 16000, 2),
+        ("mic", b"frame-2", 8000, 1),
+        ("audio", b"frame-3", 16000, 1),
+    ]
+    assert len(AudioFrameEvent._pool) == 2
+    AudioFrameEvent._pool.clear()
+    
+    print("\n✅ 音频帧事件对象池测试通过")
+
+
+def test_event_of():
+    """测试 Event.of 按载荷类型确定事件类型"""
+    print("\n" + "="*60)
+    print("测试8: Event.of")
+    print("="*60)
+    
+    # 对话类载荷：查表得到事件类型，并携带对话追踪字段
+    wakeword = Event.of("wakeword", WakewordPayload(keyword="kiwi", confidence=0.9), "msg-1",
+                        session_id="session-1", session_action=SessionAction.NEW)
+    assert wakeword.type is EventType.WAKEWORD_DETECTED
+    assert isinstance(wakeword, ConversationEvent)
+    assert wakeword.msg_id == "msg-1"
+    assert wakeword.session_id == "session-1"
+    assert wakeword.session_action is SessionAction.NEW
+    assert wakeword.payload.keyword == "kiwi"
+    
+    # 非对话类载荷创建普通事件
+    state = Event.of("state_machine", StateChangePayload(from_state="idle", to_state="listening"))
+    assert state.type is EventType.STATE_CHANGED
+    assert not isinstance(state, ConversationEvent)
+    assert state.source == "state_machine"
+    
+    # 一种载荷对应多个事件类型时必须显式传入 event_type
+    with pytest.raises(ValueError):
+        Event.of("asr", ASRPayload(text="打开空调"), "msg-2")
+    
+    asr = Event.of("asr", ASRPayload(text="打开空调", confidence=0.8), "msg-2",
+                   event_type=EventType.ASR_RECOGNITION_SUCCESS)
+    assert asr.type is EventType.ASR_RECOGNITION_SUCCESS
+    assert isinstance(asr, ConversationEvent)
+    assert asr.msg_id == "msg-2"
+    assert asr.session_id is None
+    
+    # 显式 event_type 优先于查表，字典载荷也可使用
+    gui = Event.of("orchestrator", {"text": "你好"}, event_type=EventType.GUI_UPDATE_TEXT)
+    assert gui.type is EventType.GUI_UPDATE_TEXT
+    assert not isinstance(gui, ConversationEvent)
+    assert gui.payload == {"text": "你好"}
+    
+    # 创建的事件可以正常发布给订阅者
+    controller = SystemController(debug=False)
+    received = []
+    controller.subscribe(EventType.ASR_RECOGNITION_SUCCESS, received.append)
+    controller.publish_event(asr)
+    assert received == [asr]
+    
+    print("\n✅ Event.of 测试通过")
+
+
 def run_all_tests():
     """运行所有测试"""
     print("\n" + "🧪" + "="*58 + "🧪")
@@ -261,6 +363,8 @@ def run_all_tests():
         ("事件订阅", test_event_subscription),
         ("统计信息", test_statistics),
         ("状态机集成", test_state_integration),
+        ("音频帧事件对象池", test_audio_frame_event_pool),
+        ("Event.of", test_event_of),
     ]
     
     passed = 0